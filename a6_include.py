@@ -5,6 +5,11 @@
 #              are available and how they're implemented.
 #              Don't modify the contents of this file.
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
@@ -16,7 +21,7 @@ class DynamicArray:
     """
     Class implementing a Dynamic Array
     Supported methods are:
-    append, pop, swap, get_at_index, set_at_index, length
+    append, pop, swap, get_at_index, set_at_index, length, unchecked, resize, fill
     """
 
     def __init__(self, arr=None) -> None:
@@ -77,6 +82,31 @@ class DynamicArray:
         """Return length of array."""
         return len(self._data)
 
+    def unchecked(self) -> list:
+        """
+        Return the list holding the elements, for the inner loops of the HashMaps.
+        Indexing it skips the bounds check of get_at_index and set_at_index, so
+        only indices already reduced modulo length() may be used with it, and it
+        is only valid until the array is replaced.
+        """
+        return self._data
+
+    def resize(self, length: int, value: object = None) -> None:
+        """
+        Set length of array, filling new elements with the given value or
+        dropping elements from the end, in place.
+        """
+        if length < 0:
+            raise DynamicArrayException
+        if length > len(self._data):
+            self._data.extend([value] * (length - len(self._data)))
+        else:
+            del self._data[length:]
+
+    def fill(self, value: object = None) -> None:
+        """Set every element of the array to the given value, in place."""
+        self._data[:] = [value] * len(self._data)
+
 
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
@@ -96,6 +126,81 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+# batches smaller than this are hashed one key at a time
+_MIN_VECTOR_BATCH = 64
+
+# longer keys are hashed one at a time to bound the size of the code point matrix
+_MAX_VECTOR_KEY_LENGTH = 256
+
+# rows of the code point matrix built at once
+_VECTOR_CHUNK = 65536
+
+
+def _vector_hash(keys: list, function, weighted: bool) -> list:
+    """
+    Hash a list of string keys with NumPy.  The keys are encoded to a fixed-width
+    matrix of code points, padded with zeros that add nothing to either hash, and
+    each row is summed, weighted by position if requested.  Long keys and lists
+    that are small or contain other types are hashed with the scalar function.
+    """
+    if (np is None or len(keys) < _MIN_VECTOR_BATCH
+            or not all(type(key) is str for key in keys)):
+        return [function(key) for key in keys]
+
+    hashes = []
+    for start in range(0, len(keys), _VECTOR_CHUNK):
+        chunk = keys[start:start + _VECTOR_CHUNK]
+
+        # long keys are left out of the matrix and hashed separately
+        long_keys = []
+        if max(map(len, chunk)) > _MAX_VECTOR_KEY_LENGTH:
+            long_keys = [i for i in range(len(chunk)) if len(chunk[i]) > _MAX_VECTOR_KEY_LENGTH]
+            chunk = ['' if len(key) > _MAX_VECTOR_KEY_LENGTH else key for key in chunk]
+
+        matrix = np.array(chunk, dtype=str)
+        width = matrix.dtype.itemsize // 4
+        code_points = matrix.view(np.uint32).reshape(len(chunk), width).astype(np.int64)
+
+        if weighted:
+            code_points *= np.arange(1, width + 1, dtype=np.int64)
+
+        chunk_hashes = code_points.sum(axis=1).tolist()
+        for i in long_keys:
+            chunk_hashes[i] = function(keys[start + i])
+
+        hashes.extend(chunk_hashes)
+
+    return hashes
+
+
+def hash_function_1_batch(keys: list) -> list:
+    """Hash a list of keys at once with the same results as hash_function_1"""
+    return _vector_hash(keys, hash_function_1, False)
+
+
+def hash_function_2_batch(keys: list) -> list:
+    """Hash a list of keys at once with the same results as hash_function_2"""
+    return _vector_hash(keys, hash_function_2, True)
+
+
+# batch versions of the hash functions, used by hash_keys()
+BATCH_HASH_FUNCTIONS = {
+    hash_function_1: hash_function_1_batch,
+    hash_function_2: hash_function_2_batch,
+}
+
+
+def hash_keys(function, keys: list) -> list:
+    """
+    Return the hashes of a list of keys, using the batch version of
+    the hash function if there is one
+    """
+    batch_function = BATCH_HASH_FUNCTIONS.get(function)
+    if batch_function is not None:
+        return batch_function(keys)
+    return [function(key) for key in keys]
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -103,11 +208,15 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    # no per-instance __dict__, to keep the nodes small
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None, hash: int = None) -> None:
+        """Initialize node given a key, value and optionally the full hash of the key."""
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -119,6 +228,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -141,9 +252,11 @@ class LinkedListIterator:
 class LinkedList:
     """
     Class implementing a Singly Linked List
-    Supported methods are: insert, remove, contains, length, iterator
+    Supported methods are: insert, insert_node, detach, remove, contains, length, iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -168,20 +281,38 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
-        """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+    def insert(self, key: str, value: object, hash: int = None) -> None:
+        """Insert new node at front of the list, caching the hash of the key if given."""
+        self._head = SLNode(key, value, self._head, hash)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def insert_node(self, node: SLNode) -> None:
+        """Insert an existing node at front of the list, without allocating a new one."""
+        node.next = self._head
+        self._head = node
+        self._size += 1
+
+    def detach(self) -> SLNode:
+        """
+        Remove all nodes from the list and return the first one, still linked
+        to the others, or None if the list was empty.
+        """
+        head = self._head
+        self._head = None
+        self._size = 0
+        return head
+
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
+        If the hash of the key is given, nodes with a different cached hash are skipped
+        without comparing keys.
         Return True if removal was successful, False otherwise.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -192,13 +323,23 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If the hash of the key is given, nodes with a different cached hash are skipped
+        without comparing keys.
+        """
         node = self._head
-        while node:
-            if node.key == key:
-                return node
-            node = node.next
+        if hash is None:
+            while node:
+                if node.key == key:
+                    return node
+                node = node.next
+        else:
+            while node:
+                if node.hash == hash and node.key == key:
+                    return node
+                node = node.next
         return node
 
     def length(self) -> int:
@@ -210,10 +351,14 @@ class LinkedList:
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    # no per-instance __dict__, to keep the entries small
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """Initialize an entry for use in a hash map, caching the full hash of the key."""
         self.key = key
         self.value = value
+        self.hash = hash
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -0,0 +1,329 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Benchmark suite for the HashMap implementations.  Every map is driven
+#              through the same workloads at several sizes and with each hash
+#              function, and the throughput, latency percentiles and peak memory
+#              of each run are printed and saved as JSON, e.g.
+#
+#                  python bench_hash_map.py --sizes 1000 10000 --output base.json
+#                  python bench_hash_map.py --sizes 1000 10000 --compare base.json
+
+import argparse
+import functools
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from a6_include import hash_function_1, hash_function_2
+from hash_map_oa import FlatHashMap, HashMap as OAHashMap
+from hash_map_sc import HashMap as SCHashMap
+
+
+class DictMap:
+    """
+    The built-in dict behind the HashMap methods used by the workloads, so that
+    the baseline pays the same method call per operation as the other maps.
+    """
+
+    def __init__(self, capacity: int = 11, function=None) -> None:
+        """Initialize an empty map; the capacity and hash function are ignored"""
+        self._data = {}
+
+    def put(self, key: str, value: object) -> None:
+        """Add or update a key"""
+        self._data[key] = value
+
+    def get(self, key: str):
+        """Return the value of a key, or None if it is absent"""
+        return self._data.get(key)
+
+    def remove(self, key: str) -> None:
+        """Remove a key if it is present"""
+        self._data.pop(key, None)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """Rebuild the dict, the closest thing to a resize it has"""
+        self._data = dict(self._data)
+
+
+# maps that can be benchmarked, by name
+MAPS = {
+    'sc': SCHashMap,
+    'sc_ladder': functools.partial(SCHashMap, capacity_policy='prime_ladder'),
+    'sc_pow2': functools.partial(SCHashMap, capacity_policy='pow2'),
+    'oa': OAHashMap,
+    'oa_ladder': functools.partial(OAHashMap, capacity_policy='prime_ladder'),
+    'oa_pow2': functools.partial(OAHashMap, capacity_policy='pow2'),
+    'flat': FlatHashMap,
+    'dict': DictMap,
+}
+
+# hash functions the maps are benchmarked with, by name
+FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+}
+
+
+# ------------------------------ workloads ------------------------------- #
+#
+# A workload takes a map factory and the keys of the run, sets up a map and
+# returns the list of operations to time, each a zero-argument callable.
+
+def _filled(make_map, keys: list):
+    """Return a new map holding every key"""
+    map = make_map()
+    for key in keys:
+        map.put(key, 1)
+    return map
+
+
+def _put_workload(make_map, keys: list, missing: list) -> list:
+    """Insert every key into an empty map"""
+    map = make_map()
+    return [lambda key=key: map.put(key, 1) for key in keys]
+
+
+def _get_hit_workload(make_map, keys: list, missing: list) -> list:
+    """Look up every key of a filled map"""
+    map = _filled(make_map, keys)
+    return [lambda key=key: map.get(key) for key in keys]
+
+
+def _get_miss_workload(make_map, keys: list, missing: list) -> list:
+    """Look up keys that are not in a filled map"""
+    map = _filled(make_map, keys)
+    return [lambda key=key: map.get(key) for key in missing]
+
+
+def _churn_workload(make_map, keys: list, missing: list) -> list:
+    """Remove the oldest key and insert a new one, keeping the size of a filled map"""
+    map = _filled(make_map, keys)
+    operations = []
+    for old_key, new_key in zip(keys, missing):
+        operations.append(lambda key=old_key: map.remove(key))
+        operations.append(lambda key=new_key: map.put(key, 1))
+    return operations
+
+
+def _resize_storm_workload(make_map, keys: list, missing: list) -> list:
+    """Resize a filled map back and forth between one and four times its size"""
+    map = _filled(make_map, keys)
+    capacities = [len(keys) * 4, len(keys)] * 5
+    return [lambda capacity=capacity: map.resize_table(capacity) for capacity in capacities]
+
+
+def _find_mode_workload(make_map, keys: list, missing: list) -> list:
+    """
+    Count the frequency of every value of an array with a tenth as many distinct
+    values as its length, as find_mode does, then scan the counts for the mode
+    """
+    map = make_map()
+    values = keys[:max(1, len(keys) // 10)]
+    rnd = random.Random(len(keys))
+    array = [rnd.choice(values) for _ in range(len(keys))]
+
+    def count(value):
+        frequency = map.get(value)
+        map.put(value, frequency + 1 if frequency else 1)
+
+    def mode():
+        return max(map.get(value) for value in values)
+
+    return [lambda value=value: count(value) for value in array] + [mode]
+
+
+# workloads that can be run, by name
+WORKLOADS = {
+    'put': _put_workload,
+    'get_hit': _get_hit_workload,
+    'get_miss': _get_miss_workload,
+    'churn': _churn_workload,
+    'resize_storm': _resize_storm_workload,
+    'find_mode': _find_mode_workload,
+}
+
+
+# ------------------------------- runner --------------------------------- #
+
+def make_keys(count: int, seed: int, prefix: str = '') -> list:
+    """Return count distinct random keys of 6 to 12 characters"""
+    rnd = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz0123456789'
+    keys = set()
+    while len(keys) < count:
+        keys.add(prefix + ''.join(rnd.choice(letters) for _ in range(rnd.randint(6, 12))))
+    return sorted(keys, key=lambda key: rnd.random())
+
+
+def _percentile(samples: list, fraction: float) -> float:
+    """Return a percentile of sorted samples, by the nearest rank"""
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def time_workload(workload, make_map, keys: list, missing: list) -> dict:
+    """
+    Run a workload once with the garbage collector disabled and return its
+    throughput and latency percentiles in microseconds
+    """
+    operations = workload(make_map, keys, missing)
+    samples = []
+    clock = time.perf_counter_ns
+
+    gc.collect()
+    gc.disable()
+    try:
+        for operation in operations:
+            start = clock()
+            operation()
+            samples.append(clock() - start)
+    finally:
+        gc.enable()
+
+    samples.sort()
+    seconds = sum(samples) / 1e9
+    return {
+        'ops': len(samples),
+        'seconds': seconds,
+        'ops_per_sec': len(samples) / seconds if seconds else float('inf'),
+        'p50_us': _percentile(samples, 0.50) / 1e3,
+        'p90_us': _percentile(samples, 0.90) / 1e3,
+        'p99_us': _percentile(samples, 0.99) / 1e3,
+        'max_us': samples[-1] / 1e3,
+    }
+
+
+def peak_memory(workload, make_map, keys: list, missing: list) -> int:
+    """Return the peak memory in bytes allocated by setting up and running a workload"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for operation in workload(make_map, keys, missing):
+            operation()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(maps: list, functions: list, sizes: list, workloads: list,
+        repeat: int = 3, memory: bool = True, seed: int = 0, log=print) -> list:
+    """
+    Benchmark every combination of map, hash function, size and workload and
+    return one result per combination, keeping the fastest of repeat runs.
+    The dict baseline ignores the hash function and is run once per size.
+    """
+    results = []
+    for size in sizes:
+        keys = make_keys(size, seed)
+        missing = make_keys(size, seed + 1, prefix='~')
+
+        for map_name in maps:
+            for function_name in (functions if map_name != 'dict' else ['builtin']):
+                function = FUNCTIONS.get(function_name)
+
+                def make_map(cls=MAPS[map_name], function=function):
+                    return cls(11, function)
+
+                for workload_name in workloads:
+                    workload = WORKLOADS[workload_name]
+                    timings = [time_workload(workload, make_map, keys, missing) for _ in range(repeat)]
+                    result = {
+                        'map': map_name,
+                        'function': function_name,
+                        'size': size,
+                        'workload': workload_name,
+                    }
+                    result.update(max(timings, key=lambda timing: timing['ops_per_sec']))
+                    result['peak_bytes'] = peak_memory(workload, make_map, keys, missing) if memory else None
+                    results.append(result)
+                    log(format_result(result))
+
+    return results
+
+
+def format_result(result: dict) -> str:
+    """Return a result as one line of the report"""
+    memory = '' if result['peak_bytes'] is None else f"{result['peak_bytes'] / 1e6:9.2f} MB"
+    return (f"{result['map']:5} {result['function']:16} {result['size']:>8} {result['workload']:13}"
+            f"{result['ops_per_sec']:14,.0f} ops/s  p50 {result['p50_us']:8.2f}  p90 {result['p90_us']:8.2f}"
+            f"  p99 {result['p99_us']:9.2f}  max {result['max_us']:11.2f} us {memory}")
+
+
+def _git_commit() -> str:
+    """Return the commit the benchmark is run on, or None outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list, baseline: list, threshold: float) -> list:
+    """
+    Return a line for every result whose throughput changed by more than the
+    threshold fraction against the matching result of a baseline run
+    """
+    previous = {(r['map'], r['function'], r['size'], r['workload']): r for r in baseline}
+    lines = []
+    for result in results:
+        old = previous.get((result['map'], result['function'], result['size'], result['workload']))
+        if old is None:
+            continue
+
+        ratio = result['ops_per_sec'] / old['ops_per_sec']
+        if abs(ratio - 1) > threshold:
+            change = 'faster' if ratio > 1 else 'SLOWER'
+            lines.append(f"{change:6} x{ratio:5.2f}  {result['map']} {result['function']} "
+                         f"{result['size']} {result['workload']}")
+    return lines
+
+
+def main(argv=None) -> int:
+    """Parse the command line, run the benchmarks and save or compare the results"""
+    parser = argparse.ArgumentParser(description='Benchmark the HashMap implementations.')
+    parser.add_argument('--maps', nargs='+', default=['sc', 'oa', 'dict'], choices=sorted(MAPS))
+    parser.add_argument('--functions', nargs='+', default=sorted(FUNCTIONS), choices=sorted(FUNCTIONS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000])
+    parser.add_argument('--workloads', nargs='+', default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument('--repeat', type=int, default=3, help='runs per combination, the fastest is kept')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random keys')
+    parser.add_argument('--no-memory', action='store_true', help='skip the peak memory pass')
+    parser.add_argument('--output', help='save the results to this JSON file')
+    parser.add_argument('--compare', help='JSON file of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='throughput change reported by --compare, as a fraction')
+    args = parser.parse_args(argv)
+
+    results = run(args.maps, args.functions, args.sizes, args.workloads,
+                  args.repeat, not args.no_memory, args.seed)
+
+    if args.output:
+        report = {
+            'commit': _git_commit(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'arguments': vars(args),
+            'results': results,
+        }
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)['results']
+        lines = compare(results, baseline, args.threshold)
+        print(f"\n{len(lines)} changes over {args.threshold:.0%} against {args.compare}")
+        for line in lines:
+            print(line)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Additional hash functions for string keys that can be passed as the
+#              function argument of both HashMaps (SC & OA), with seeded variants
+#              and a measure of how evenly a function spreads keys over buckets.
+
+import os
+
+from a6_include import hash_function_1, hash_function_2
+
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+# 64-bit FNV-1a parameters
+_FNV_OFFSET_BASIS = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+
+
+def _key_bytes(key: str) -> bytes:
+    """Return the UTF-8 encoding of a key, keeping lone surrogates"""
+    return key.encode('utf-8', 'surrogatepass')
+
+
+def _fnv1a(data: bytes, basis: int) -> int:
+    """64-bit FNV-1a of a byte string, starting from the given offset basis"""
+    hash = basis
+    for byte in data:
+        hash = ((hash ^ byte) * _FNV_PRIME) & _MASK_64
+    return hash
+
+
+def fnv1a_hash(key: str) -> int:
+    """64-bit FNV-1a hash of the UTF-8 encoding of the key"""
+    return _fnv1a(_key_bytes(key), _FNV_OFFSET_BASIS)
+
+
+def _rotate(value: int, bits: int) -> int:
+    """Rotate a 64-bit integer left by the given number of bits"""
+    return ((value << bits) | (value >> (64 - bits))) & _MASK_64
+
+
+def _siphash(data: bytes, k0: int, k1: int) -> int:
+    """SipHash-2-4 of a byte string with the 128-bit key (k0, k1)"""
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    def rounds(v0, v1, v2, v3, count):
+        for _ in range(count):
+            v0 = (v0 + v1) & _MASK_64
+            v1 = _rotate(v1, 13) ^ v0
+            v0 = _rotate(v0, 32)
+            v2 = (v2 + v3) & _MASK_64
+            v3 = _rotate(v3, 16) ^ v2
+            v0 = (v0 + v3) & _MASK_64
+            v3 = _rotate(v3, 21) ^ v0
+            v2 = (v2 + v1) & _MASK_64
+            v1 = _rotate(v1, 17) ^ v2
+            v2 = _rotate(v2, 32)
+        return v0, v1, v2, v3
+
+    # compress the message 8 bytes at a time, the last word holding the length
+    length = len(data)
+    tail = length - length % 8
+    for start in range(0, tail, 8):
+        word = int.from_bytes(data[start:start + 8], 'little')
+        v3 ^= word
+        v0, v1, v2, v3 = rounds(v0, v1, v2, v3, 2)
+        v0 ^= word
+
+    word = int.from_bytes(data[tail:], 'little') | ((length & 0xFF) << 56)
+    v3 ^= word
+    v0, v1, v2, v3 = rounds(v0, v1, v2, v3, 2)
+    v0 ^= word
+
+    # finalization
+    v2 ^= 0xFF
+    v0, v1, v2, v3 = rounds(v0, v1, v2, v3, 4)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def siphash_hash(key: str) -> int:
+    """SipHash-2-4 of the UTF-8 encoding of the key, using an all-zero key"""
+    return _siphash(_key_bytes(key), 0, 0)
+
+
+def builtin_hash(key: str) -> int:
+    """Python's built-in hash of the key, as a non-negative 64-bit integer"""
+    return hash(key) & _MASK_64
+
+
+# hash functions that can be passed to the HashMap constructors, by name
+HASH_FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+    'fnv1a': fnv1a_hash,
+    'siphash': siphash_hash,
+    'builtin': builtin_hash,
+}
+
+
+# hash functions whose hashes change from one process to the next, because Python
+# randomizes the hashes of strings, so hashes cached in one process are useless in another
+PROCESS_RANDOMIZED_HASH_FUNCTIONS = frozenset({builtin_hash})
+
+
+def is_process_randomized(function) -> bool:
+    """Return True if the hashes of the function differ between processes"""
+    return function in PROCESS_RANDOMIZED_HASH_FUNCTIONS
+
+
+def _seeded_fnv1a(seed: int):
+    """Return FNV-1a with the seed folded into the offset basis"""
+    basis = _fnv1a(seed.to_bytes(16, 'little'), _FNV_OFFSET_BASIS)
+
+    def seeded_fnv1a_hash(key: str) -> int:
+        return _fnv1a(_key_bytes(key), basis)
+
+    return seeded_fnv1a_hash
+
+
+def _seeded_siphash(seed: int):
+    """Return SipHash-2-4 keyed with the seed"""
+    k0, k1 = seed & _MASK_64, (seed >> 64) & _MASK_64
+
+    def seeded_siphash_hash(key: str) -> int:
+        return _siphash(_key_bytes(key), k0, k1)
+
+    return seeded_siphash_hash
+
+
+def _seeded_builtin(seed: int):
+    """Return the built-in hash of the key paired with the seed"""
+
+    def seeded_builtin_hash(key: str) -> int:
+        return hash((seed, key)) & _MASK_64
+
+    return seeded_builtin_hash
+
+
+# factories of the seeded variant of each hash function, used by seeded()
+SEEDED_HASH_FUNCTIONS = {
+    fnv1a_hash: _seeded_fnv1a,
+    siphash_hash: _seeded_siphash,
+    builtin_hash: _seeded_builtin,
+}
+
+
+def random_seed() -> int:
+    """Return a random 128-bit seed from the operating system"""
+    return int.from_bytes(os.urandom(16), 'little')
+
+
+def seeded(function, seed: int):
+    """
+    Return the variant of a hash function keyed with the given seed.
+    Keys that collide for one seed are unlikely to collide for another, so a map
+    with a random seed cannot be flooded with keys chosen to share a bucket.
+    Raise ValueError if the function has no seeded variant.
+    """
+    factory = SEEDED_HASH_FUNCTIONS.get(function)
+    if factory is None:
+        raise ValueError(f"hash function cannot be seeded: {getattr(function, '__name__', function)}")
+    return factory(seed & ((1 << 128) - 1))
+
+
+def bucket_distribution(function, keys, capacity: int) -> dict:
+    """
+    Hash the keys into the given number of buckets and return how evenly they
+    are spread: the number of empty buckets, the longest chain, and the ratio of
+    the expected probe count to that of a uniformly random hash, which is 1.0 for
+    an ideal function and grows with clustering.
+    """
+    counts = [0] * capacity
+    for key in keys:
+        counts[function(key) % capacity] += 1
+
+    # a successful lookup probes (chain length + 1) / 2 nodes on average
+    n = len(keys)
+    probes = sum(count * (count + 1) for count in counts) / (2 * n) if n else 0.0
+    uniform = 1 + (n - 1) / (2 * capacity) if n else 0.0
+
+    return {
+        'empty_buckets': counts.count(0),
+        'longest_chain': max(counts),
+        'probe_ratio': probes / uniform if n else 0.0,
+    }
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    from itertools import islice, permutations
+
+    print("\nbucket distribution of 10000 keys in 10007 buckets")
+    print("--------------------------------------------------")
+    key_sets = {
+        'numbered': ['str' + str(i) for i in range(10000)],
+        'words': [''.join(chr(97 + (i * 7 + j * 3) % 26) for j in range(i % 8 + 3)) + str(i // 26)
+                  for i in range(10000)],
+        'anagrams': [''.join(letters) for letters in islice(permutations('abcdefgh'), 10000)],
+    }
+    for name, function in HASH_FUNCTIONS.items():
+        for key_set, keys in key_sets.items():
+            stats = bucket_distribution(function, keys, 10007)
+            print(f"{name:16} {key_set:9} empty {stats['empty_buckets']:5} "
+                  f"longest {stats['longest_chain']:4} probe ratio {stats['probe_ratio']:8.2f}")
+
+    print("\nseeded hash functions")
+    print("---------------------")
+    seed = random_seed()
+    for name in ('fnv1a', 'siphash', 'builtin'):
+        function = seeded(HASH_FUNCTIONS[name], seed)
+        print(name, function('key1') == function('key1'),
+              function('key1') != seeded(HASH_FUNCTIONS[name], seed + 1)('key1'))
+    try:
+        seeded(hash_function_1, seed)
+    except ValueError as error:
+        print(error)
@@ -0,0 +1,280 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Approximate mode of a stream in fixed memory, with a Count-Min
+#              Sketch and a fixed number of Space-Saving candidate counters
+
+import math
+from array import array
+from hashlib import blake2b
+
+from a6_include import DynamicArray, hash_function_1
+from hash_map_frequency import FrequencyCounter
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: depth rows of width counters.  Every key adds to one
+    counter per row and its estimate is the smallest of those counters, which
+    is never below the true count and, with probability at least 1 - delta,
+    exceeds it by at most epsilon times the total count.
+    """
+
+    def __init__(self, epsilon: float = 0.001, delta: float = 0.01) -> None:
+        """
+        Initialize an empty sketch for the given error and failure probability
+        """
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+
+        self._width = math.ceil(math.e / epsilon)
+        self._depth = math.ceil(math.log(1 / delta))
+        self._counters = array('q', bytes(8 * self._width * self._depth))
+        self._total = 0
+
+    def get_width(self) -> int:
+        """
+        Return the number of counters of each row
+        """
+        return self._width
+
+    def get_depth(self) -> int:
+        """
+        Return the number of rows
+        """
+        return self._depth
+
+    def get_total(self) -> int:
+        """
+        Return the total count added to the sketch
+        """
+        return self._total
+
+    def _indices(self, key: str) -> list:
+        """
+        A method that takes as a parameter a key and returns the index of its counter
+        in every row, derived from two 64-bit hashes as h1 + row * h2.
+        :param key: string
+        :return: list of integers
+        """
+
+        digest = blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        width = self._width
+
+        return [row * width + (h1 + row * h2) % width for row in range(self._depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """
+        A method that takes as parameters a key and a count, adds the count to the key
+        and returns the new estimate of the key.
+        :param key: string
+        :param count: integer
+        :return: integer
+        """
+
+        counters = self._counters
+        estimate = None
+
+        for index in self._indices(key):
+            counters[index] += count
+            if estimate is None or counters[index] < estimate:
+                estimate = counters[index]
+
+        self._total += count
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        """
+        A method that takes as a parameter a key and returns the estimate of its count.
+        :param key: string
+        :return: integer
+        """
+
+        counters = self._counters
+        return min(counters[index] for index in self._indices(key))
+
+
+class HeavyHitters:
+    """
+    Finds the most frequent keys of a stream in memory that does not grow with
+    the number of distinct keys.  A Space-Saving FrequencyCounter keeps at most
+    `candidates` keys: a new key replaces one of the least frequent ones and
+    inherits its count, so a key occurring more than total / candidates times
+    is always kept.  Both its counts and the Count-Min Sketch estimates are
+    upper bounds of the true counts, so the smaller of the two is reported.
+    """
+
+    def __init__(self, epsilon: float = 0.001, delta: float = 0.01, candidates: int = None,
+                 function: callable = hash_function_1) -> None:
+        """
+        Initialize new HeavyHitters with a Count-Min Sketch for the given error and failure
+        probability and ceil(1 / epsilon) candidate counters unless a number is given
+        """
+        self._sketch = CountMinSketch(epsilon, delta)
+        self._capacity = candidates if candidates is not None else math.ceil(1 / epsilon)
+
+        if self._capacity < 1:
+            raise ValueError("candidates must be at least 1")
+
+        self._candidates = FrequencyCounter(function=function)
+
+    def get_total(self) -> int:
+        """
+        Return the number of keys added, with repetitions
+        """
+        return self._sketch.get_total()
+
+    def add(self, key: str) -> None:
+        """
+        A method that takes as a parameter a key and counts one occurrence of it.
+        :param key: string
+        :return: None
+        """
+
+        self._sketch.add(key)
+        candidates = self._candidates
+
+        if candidates.get_size() < self._capacity or candidates.frequency(key) > 0:
+            candidates.add(key)
+        else:
+            candidates.replace_lowest(key)
+
+    def update(self, iterable) -> None:
+        """
+        A method that takes as a parameter any iterable of keys and counts every key.
+        :param iterable: iterable of strings
+        :return: None
+        """
+
+        for key in iterable:
+            self.add(key)
+
+    def estimate(self, key: str) -> int:
+        """
+        A method that takes as a parameter a key and returns the estimate of its count,
+        never lower than the true count.
+        :param key: string
+        :return: integer
+        """
+
+        sketch_estimate = self._sketch.estimate(key)
+        candidate_count = self._candidates.frequency(key)
+
+        if candidate_count:
+            return min(sketch_estimate, candidate_count)
+
+        return sketch_estimate
+
+    def top_k(self, k: int) -> DynamicArray:
+        """
+        A method that takes as a parameter a number k and returns a DynamicArray of
+        (key, estimate) tuples with the k candidates of highest estimate, from the
+        highest down.
+        :param k: integer
+        :return: DynamicArray
+        """
+
+        # a candidate count bounds the estimate, so candidates are read from the highest
+        # count down until the next count cannot beat the k-th best estimate
+        candidates = self._candidates.top_k(self._capacity)
+        best = []
+
+        for i in range(candidates.length()):
+            key, count = candidates[i]
+
+            if len(best) >= k and count < best[-1][1]:
+                break
+
+            best.append((key, self.estimate(key)))
+            best.sort(key=lambda pair: -pair[1])
+            del best[k:]
+
+        return DynamicArray(best)
+
+    def mode(self) -> (DynamicArray, int):
+        """
+        A method that returns a tuple containing a DynamicArray with the likely mode(s)
+        and their estimated frequency, or an empty DynamicArray and None if nothing
+        has been added.
+        :return: tuple (DynamicArray, int)
+        """
+
+        candidates = self._candidates.top_k(self._capacity)
+        mode_arr = DynamicArray()
+        max_frequency = None
+
+        for i in range(candidates.length()):
+            key, count = candidates[i]
+
+            if max_frequency is not None and count < max_frequency:
+                break
+
+            frequency = self.estimate(key)
+
+            if max_frequency is None or frequency > max_frequency:
+                max_frequency = frequency
+                mode_arr = DynamicArray()
+
+            if frequency == max_frequency:
+                mode_arr.append(key)
+
+        return mode_arr, max_frequency
+
+
+def find_mode_approximate(iterable, epsilon: float = 0.001, delta: float = 0.01,
+                          candidates: int = None) -> (DynamicArray, int):
+    """
+    A function that takes as a parameter any iterable of keys and returns a tuple
+    containing a DynamicArray with the likely mode(s) of the iterable and their
+    estimated frequency, using memory that depends on epsilon, delta and the
+    number of candidates but not on the number of distinct keys.
+    :param iterable: iterable of strings
+    :param epsilon: float
+    :param delta: float
+    :param candidates: integer
+    :return: tuple (DynamicArray, int)
+    """
+
+    heavy_hitters = HeavyHitters(epsilon, delta, candidates)
+    heavy_hitters.update(iterable)
+    return heavy_hitters.mode()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import random
+    import tracemalloc
+
+    from hash_map_sc import find_mode
+
+    print("\nfind_mode_approximate - example 1")
+    print("---------------------------------")
+    mode, frequency = find_mode_approximate(["apple", "apple", "grape", "melon", "peach"])
+    print(f"Mode : {mode}, Frequency: {frequency}")
+
+    print("\nfind_mode_approximate - accuracy against find_mode")
+    print("--------------------------------------------------")
+    rnd = random.Random(7)
+
+    # Zipf-like streams with many distinct keys
+    for distinct, length, exponent in ((1000, 20000, 1.1), (50000, 100000, 1.05), (200000, 200000, 0.9)):
+        weights = [1 / (rank ** exponent) for rank in range(1, distinct + 1)]
+        keys = ['key' + str(rank) for rank in range(distinct)]
+        stream = rnd.choices(keys, weights, k=length)
+
+        tracemalloc.start()
+        exact_mode, exact_frequency = find_mode(DynamicArray(stream))
+        exact_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        for epsilon in (0.01, 0.001):
+            tracemalloc.start()
+            approximate_mode, approximate_frequency = find_mode_approximate(stream, epsilon)
+            approximate_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            print(f"{distinct:6} distinct, epsilon {epsilon}: exact {exact_mode} {exact_frequency}"
+                  f" ({exact_memory / 1e6:.1f} MB), approximate {approximate_mode} {approximate_frequency}"
+                  f" ({approximate_memory / 1e6:.1f} MB)")
@@ -0,0 +1,171 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Array-backed buckets for the separate chaining HashMap (SC): every
+#              bucket keeps the hashes, keys and values of its pairs in one list
+
+
+class ArrayBucket(list):
+    """
+    Bucket of the separate chaining HashMap that stores its pairs in place in one
+    list, as hash, key, value triples: [h0, k0, v0, h1, k1, v1, ...].  A chain scan
+    reads contiguous list items instead of following node links, and no object is
+    allocated per pair.
+    Iterating the bucket yields its (hash, key, value) triples, read in place, so
+    code that walks the buckets of the map reads them by position rather than as
+    nodes.
+    """
+
+    __slots__ = ()
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'ARRAY [' + ', '.join('(' + str(self[i + 1]) + ': ' + str(self[i + 2]) + ')'
+                                     for i in range(0, len(self), 3)) + ']'
+
+    def __iter__(self):
+        """
+        Return an iterator over the (hash, key, value) triples of the bucket, from the
+        last pair added to the first, the order of a linked list.  The pair just read
+        can be removed while iterating, as remove() only moves the last pair, which was
+        read already, into its place.
+        """
+        index = len(self) - 3
+
+        while index >= 0:
+
+            # removing pairs that were not read yet shortens the list
+            if index < len(self):
+                yield self[index], self[index + 1], self[index + 2]
+
+            index -= 3
+
+    def find(self, key: str, hash: int) -> int:
+        """Return the position of the pair with matching key and hash, or -1."""
+        index, end = 0, len(self)
+
+        # only every third item is a hash, so the values are never compared with it
+        while index < end:
+            if self[index] == hash and self[index + 1] == key:
+                return index
+            index += 3
+
+        return -1
+
+    def get(self, key: str, hash: int) -> object:
+        """Return value of the pair with matching key, or None if no match."""
+        # same scan as find(), inlined as lookups are the hot path
+        index, end = 0, len(self)
+
+        while index < end:
+            if self[index] == hash and self[index + 1] == key:
+                return self[index + 2]
+            index += 3
+
+    def put(self, key: str, value: object, hash: int) -> bool:
+        """
+        Update the value of the pair with matching key, or add a new pair.
+        Return True if a pair was added, False otherwise.
+        """
+        index = self.find(key, hash)
+
+        if index >= 0:
+            self[index + 2] = value
+            return False
+
+        self += (hash, key, value)
+        return True
+
+    def increment(self, key: str, delta: object, hash: int) -> tuple:
+        """
+        Add delta to the value of the pair with matching key, or add a new pair
+        with delta as its value.  Return the new value and True if a pair was added.
+        """
+        index = self.find(key, hash)
+
+        if index >= 0:
+            self[index + 2] += delta
+            return self[index + 2], False
+
+        self += (hash, key, delta)
+        return delta, True
+
+    def insert(self, key: str, value: object, hash: int = None) -> None:
+        """Add a new pair whose key is not in the bucket."""
+        self += (hash, key, value)
+
+    def remove(self, key: str, hash: int) -> bool:
+        """
+        Remove the pair with matching key, moving the last pair into its place.
+        Return True if removal was successful, False otherwise.
+        """
+        index = self.find(key, hash)
+
+        if index < 0:
+            return False
+
+        last = len(self) - 3
+        if index < last:
+            self[index], self[index + 1], self[index + 2] = self[last], self[last + 1], self[last + 2]
+
+        del self[last:]
+        return True
+
+    def detach(self) -> None:
+        """Remove all pairs from the bucket."""
+        del self[:]
+
+    def length(self) -> int:
+        """Return the number of pairs of the bucket."""
+        return len(self) // 3
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    import hash_map_sc
+    from a6_include import SLNode
+    from hash_functions import builtin_hash
+
+    print("\nArrayBucket - example 1")
+    print("-----------------------")
+    bucket = ArrayBucket()
+    for key, value in (('a', 1), ('b', 2), ('c', 3)):
+        bucket.put(key, value, builtin_hash(key))
+    bucket.put('b', 20, builtin_hash('b'))
+    print(bucket, bucket.length(), bucket.get('b', builtin_hash('b')), bucket.get('d', builtin_hash('d')))
+    print(bucket.remove('a', builtin_hash('a')), bucket.remove('a', builtin_hash('a')), bucket)
+
+    print("\nArrayBucket - linked list and array buckets")
+    print("-------------------------------------------")
+    keys = ['key' + str(i) for i in range(100000)]
+    missing = ['missing' + str(i) for i in range(100000)]
+
+    for buckets in ('linked', 'array'):
+        m = hash_map_sc.HashMap(11, builtin_hash, buckets=buckets)
+
+        start = time.perf_counter()
+        for key in keys:
+            m.put(key, 1)
+        put_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for key in keys:
+            m.get(key)
+        get_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for key in missing:
+            m.contains_key(key)
+        miss_seconds = time.perf_counter() - start
+
+        # the memory of the buckets and their nodes, the keys and values are shared
+        bucket_list = m._buckets.unchecked()
+        memory = sys.getsizeof(bucket_list) + sum(map(sys.getsizeof, bucket_list))
+        if buckets == 'linked':
+            memory += m.get_size() * sys.getsizeof(SLNode('key', 1))
+
+        print(f"{buckets}: put {put_seconds:.2f}s, get {get_seconds:.2f}s, "
+              f"contains_key missing {miss_seconds:.2f}s, buckets {memory / 1e6:.1f} MB")
@@ -0,0 +1,144 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Capacity policies shared by both HashMaps (SC & OA): the capacities
+#              a table may have, and how the hash of a key is adapted to them
+
+from bisect import bisect_left
+
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+# bases for which Miller-Rabin is exact for every n < 3.3 * 10 ** 24
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+# growth primes: every prime is the smallest prime above twice the previous one,
+# so doubling the capacity of a table moves it exactly one step up the ladder
+PRIME_LADDER = (
+    3, 7, 17, 37, 79, 163, 331, 673, 1361, 2729, 5471, 10949, 21911, 43853, 87719, 175447,
+    350899, 701819, 1403641, 2807303, 5614657, 11229331, 22458671, 44917381, 89834777,
+    179669557, 359339171, 718678369, 1437356741, 2874713497, 5749427029, 11498854069,
+    22997708177, 45995416409, 91990832831, 183981665689, 367963331389, 735926662813,
+    1471853325643, 2943706651297, 5887413302609, 11774826605231, 23549653210463,
+    47099306420939, 94198612841897, 188397225683869, 376794451367743, 753588902735509,
+    1507177805471059, 3014355610942127, 6028711221884317, 12057422443768697, 24114844887537407,
+    48229689775074839, 96459379550149709, 192918759100299439, 385837518200598889,
+    771675036401197787, 1543350072802395601, 3086700145604791213, 6173400291209582429,
+)
+
+
+def is_prime(number: int) -> bool:
+    """
+    Determine if given integer is a prime number with the Miller-Rabin test, which
+    is exact for every capacity a table can have
+    """
+    if number < 2:
+        return False
+
+    for witness in _WITNESSES:
+        if number % witness == 0:
+            return number == witness
+
+    # number - 1 = d * 2 ** s with d odd
+    d, s = number - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for witness in _WITNESSES:
+        x = pow(witness, d, number)
+
+        if x == 1 or x == number - 1:
+            continue
+
+        for _ in range(s - 1):
+            x = x * x % number
+            if x == number - 1:
+                break
+        else:
+            return False
+
+    return True
+
+
+def next_prime(capacity: int) -> int:
+    """
+    Return the closest odd prime number from the given number up, the capacity
+    HashMap._next_prime returns, without trial division
+    """
+    if capacity % 2 == 0:
+        capacity += 1
+
+    while not is_prime(capacity):
+        capacity += 2
+
+    return capacity
+
+
+def ladder_prime(capacity: int) -> int:
+    """
+    Return the smallest prime of PRIME_LADDER from the given number up, or the
+    next prime above the top of the ladder
+    """
+    index = bisect_left(PRIME_LADDER, capacity)
+
+    if index == len(PRIME_LADDER):
+        return next_prime(capacity)
+
+    return PRIME_LADDER[index]
+
+
+def power_of_two(capacity: int) -> int:
+    """Return the smallest power of two from the given number up"""
+    return 1 << max(capacity - 1, 0).bit_length()
+
+
+def mix(hash_value: int) -> int:
+    """
+    Return the 64-bit hash mixed with the SplitMix64 finalizer, so every bit of
+    the hash affects the low bits a power of two capacity keeps
+    """
+    hash_value &= _MASK_64
+    hash_value = ((hash_value ^ (hash_value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    hash_value = ((hash_value ^ (hash_value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return hash_value ^ (hash_value >> 31)
+
+
+def mixed(function):
+    """Return a hash function that mixes the hashes of the given function"""
+
+    def mixed_hash(key: str) -> int:
+        return mix(function(key))
+
+    mixed_hash.__name__ = 'mixed_' + getattr(function, '__name__', 'hash')
+    return mixed_hash
+
+
+# capacity policies accepted by the HashMap constructors: the capacity a table
+# of at least the given number of buckets gets
+CAPACITY_POLICIES = {
+    'prime': next_prime,
+    'prime_ladder': ladder_prime,
+    'pow2': power_of_two,
+}
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import time
+
+    from hash_map_sc import HashMap
+
+    print("\nCapacity policies - capacity for a table of n buckets")
+    print("-----------------------------------------------------")
+    trial_division = HashMap()._next_prime
+
+    for n in (1000, 10 ** 6, 10 ** 8, 4 * 10 ** 8):
+        line = f"{n:>11}:"
+
+        for name, function in (('trial division', trial_division), ('prime', next_prime),
+                               ('prime_ladder', ladder_prime), ('pow2', power_of_two)):
+            start = time.perf_counter()
+            capacity = function(n)
+            line += f"  {name} {capacity} ({(time.perf_counter() - start) * 1e3:.3f}ms)"
+
+        print(line)
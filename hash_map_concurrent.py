@@ -0,0 +1,521 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Thread-safe Hash Map with Separate Chaining and lock striping
+
+from threading import Lock, Thread
+
+from a6_include import (DynamicArray, LinkedList,
+                        hash_function_1, hash_function_2)
+from hash_functions import seeded
+from hash_map_capacity import next_prime
+
+
+class ConcurrentHashMap:
+    """
+    HashMap with separate chaining that can be shared between threads.
+    The buckets are guarded by a fixed number of locks, bucket i by lock
+    i % stripes, so writers to different stripes do not wait for each other.
+    Readers take no lock at all: a chain is only ever changed by replacing
+    a single reference (the head of the list or the next of a node), so a
+    reader always walks a consistent chain.  A resize takes every lock,
+    copies the nodes into new buckets and then publishes the new buckets and
+    capacity together, so readers that started on the old buckets finish on
+    them and writers that computed an index in the old buckets retry.
+    """
+
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1,
+                 stripes: int = 16, seed: int = None) -> None:
+        """
+        Initialize new ConcurrentHashMap that uses
+        separate chaining for collision resolution and
+        the given number of locks for its buckets.
+        When a seed is given the keys are hashed with the seeded variant of the hash
+        function (see hash_functions.seeded).
+        """
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+
+        self._function = function
+        self._seed = seed
+        self._hash_function = function if seed is None else seeded(function, seed)
+
+        self._locks = [Lock() for _ in range(stripes)]
+
+        # number of keys in the buckets of each stripe
+        self._counts = [0] * stripes
+
+        # capacity must be a prime number
+        capacity = next_prime(capacity)
+        self._table = (self._new_buckets(capacity), capacity)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as HashMap
+        """
+        buckets, capacity = self._table
+        out = ''
+        for i in range(capacity):
+            out += str(i) + ': ' + str(buckets[i]) + '\n'
+        return out
+
+    @staticmethod
+    def _new_buckets(capacity: int) -> DynamicArray:
+        """
+        A method that takes as a parameter a capacity and returns
+        a DynamicArray of that many empty linked lists.
+        :param capacity: integer
+        :return: DynamicArray
+        """
+
+        return DynamicArray([LinkedList() for _ in range(capacity)])
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return sum(self._counts)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._table[1]
+
+    def table_load(self) -> float:
+        """
+        A method that returns the current hash table load factor.
+        :return: float
+        """
+
+        return self.get_size() / self.get_capacity()
+
+    def empty_buckets(self) -> int:
+        """
+        A method that returns the number of empty buckets in the hash table.
+        :return: integer
+        """
+
+        buckets, capacity = self._table
+        return sum(1 for i in range(capacity) if buckets[i].length() == 0)
+
+    # ------------------------------------------------------------------ #
+
+    def _lock_bucket(self, hash_value: int):
+        """
+        A method that takes as a parameter a hash value, acquires the lock of the bucket
+        of the hash value in the current buckets and returns the bucket and the index of
+        its stripe.  If a resize replaced the buckets while the lock was being acquired,
+        the lock is released and the bucket of the new buckets is locked instead.
+        The caller must release the lock of the returned stripe.
+        :param hash_value: integer
+        :return: tuple (LinkedList, int)
+        """
+
+        while True:
+            table = self._table
+            buckets, capacity = table
+            index = hash_value % capacity
+            stripe = index % len(self._locks)
+
+            self._locks[stripe].acquire()
+
+            if self._table is table:
+                return buckets[index], stripe
+
+            self._locks[stripe].release()
+
+    def _grow_if_needed(self) -> None:
+        """
+        A method that doubles the capacity once the table load passes 1.0, called after
+        a key is added.  The counts of the stripes are added up without any lock, and the
+        locks of all the stripes are only taken when the size is over the capacity, then
+        the size is checked again once they are held.
+        :return: None
+        """
+
+        # the stripes of a skewed table can hold more than their share of the keys long
+        # before the table is full, so the size of the whole table is checked
+        if sum(self._counts) <= self._table[1]:
+            return
+
+        self._acquire_all()
+
+        try:
+            # another thread may have resized the table in the meantime
+            capacity = self._table[1]
+
+            if sum(self._counts) > capacity:
+                self._rehash(capacity * 2)
+        finally:
+            self._release_all()
+
+    def put(self, key: str, value: object) -> None:
+        """
+        A method that takes as parameters a key-value pair and updates the value of the key,
+        or inserts the pair if the key is not in the hash table.  Only the lock of the stripe
+        of the key is held, and the table is doubled once its load factor passes 1.0.
+        :param key: string
+        :param value: object
+        :return: None
+        """
+
+        hash_value = self._hash_function(key)
+        bucket, stripe = self._lock_bucket(hash_value)
+
+        try:
+            node = bucket.contains(key, hash_value)
+
+            if node:
+                node.value = value
+                return
+
+            bucket.insert(key, value, hash_value)
+            self._counts[stripe] += 1
+        finally:
+            self._locks[stripe].release()
+
+        self._grow_if_needed()
+
+    def put_if_absent(self, key: str, value: object) -> object:
+        """
+        A method that takes as parameters a key-value pair and inserts the pair only if the
+        key is not in the hash table, as one atomic operation.  It returns the value already
+        stored for the key, or None if the pair was inserted.
+        :param key: string
+        :param value: object
+        :return: object
+        """
+
+        hash_value = self._hash_function(key)
+        bucket, stripe = self._lock_bucket(hash_value)
+
+        try:
+            node = bucket.contains(key, hash_value)
+
+            if node:
+                return node.value
+
+            bucket.insert(key, value, hash_value)
+            self._counts[stripe] += 1
+        finally:
+            self._locks[stripe].release()
+
+        self._grow_if_needed()
+
+    def compute(self, key: str, function: callable) -> object:
+        """
+        A method that takes as parameters a key and a function of the key and its current
+        value (None if the key is not in the hash table) and stores the result of the
+        function as the new value of the key, as one atomic operation.  If the function
+        returns None the key is removed.  The function is called with the lock of the
+        stripe held, so it must be short and must not use the map.
+        :param key: string
+        :param function: callable (key, value) -> value
+        :return: the new value of the key
+        """
+
+        hash_value = self._hash_function(key)
+        bucket, stripe = self._lock_bucket(hash_value)
+        added = False
+
+        try:
+            node = bucket.contains(key, hash_value)
+            value = function(key, node.value if node else None)
+
+            if value is None:
+                if node:
+                    bucket.remove(key, hash_value)
+                    self._counts[stripe] -= 1
+            elif node:
+                node.value = value
+            else:
+                bucket.insert(key, value, hash_value)
+                self._counts[stripe] += 1
+                added = True
+        finally:
+            self._locks[stripe].release()
+
+        if added:
+            self._grow_if_needed()
+
+        return value
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        A method that takes as parameters a key and an amount, adds the amount to the value
+        of the key, starting from 0 if the key is not in the hash table, and returns the new
+        value, as one atomic operation.
+        :param key: string
+        :param delta: integer
+        :return: integer
+        """
+
+        hash_value = self._hash_function(key)
+        bucket, stripe = self._lock_bucket(hash_value)
+
+        try:
+            node = bucket.contains(key, hash_value)
+
+            if node:
+                node.value += delta
+                return node.value
+
+            bucket.insert(key, delta, hash_value)
+            self._counts[stripe] += 1
+        finally:
+            self._locks[stripe].release()
+
+        self._grow_if_needed()
+        return delta
+
+    def get(self, key: str) -> object:
+        """
+        A method that takes as a parameter a key and returns its value, or None if the key
+        is not in the hash table.  No lock is taken.
+        :param key: string
+        :return: object
+        """
+
+        hash_value = self._hash_function(key)
+        buckets, capacity = self._table
+        node = buckets[hash_value % capacity].contains(key, hash_value)
+
+        if node:
+            return node.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        A method that takes as a parameter a key and returns True if the key is in the
+        hash table and False otherwise.  No lock is taken.
+        :param key: string
+        :return: boolean
+        """
+
+        hash_value = self._hash_function(key)
+        buckets, capacity = self._table
+        return buckets[hash_value % capacity].contains(key, hash_value) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        A method that takes as a parameter a key and removes it from the hash table
+        if it is found.  Only the lock of the stripe of the key is held.
+        :param key: string
+        :return: None
+        """
+
+        hash_value = self._hash_function(key)
+        bucket, stripe = self._lock_bucket(hash_value)
+
+        try:
+            if bucket.remove(key, hash_value):
+                self._counts[stripe] -= 1
+        finally:
+            self._locks[stripe].release()
+
+    # ------------------------------------------------------------------ #
+
+    def _acquire_all(self) -> None:
+        """
+        A method that acquires the locks of all the stripes, always in the same order
+        so that two threads doing so cannot deadlock.
+        :return: None
+        """
+
+        for lock in self._locks:
+            lock.acquire()
+
+    def _release_all(self) -> None:
+        """
+        A method that releases the locks of all the stripes.
+        :return: None
+        """
+
+        for lock in reversed(self._locks):
+            lock.release()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        A method that takes as a parameter an integer representing a new capacity and
+        resizes the hash table following the same capacity rules as HashMap.  All the
+        locks are held while the nodes are copied into the new buckets, so no key is
+        changed during the resize, and readers keep using the old buckets until the
+        new ones are published.
+        :param new_capacity: integer
+        :return: None
+        """
+
+        if new_capacity < 1:
+            return
+
+        self._acquire_all()
+
+        try:
+            self._rehash(new_capacity)
+        finally:
+            self._release_all()
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        A method that takes as a parameter a requested capacity and copies the nodes into
+        new buckets of the closest prime capacity that keeps the table load <= 1.0, then
+        publishes the new buckets.  The caller must hold all the locks.
+        :param new_capacity: integer
+        :return: None
+        """
+
+        buckets, capacity = self._table
+        size = sum(self._counts)
+
+        # capacity must be a prime number
+        new_capacity = next_prime(new_capacity)
+        while size / new_capacity > 1.0:
+            new_capacity = next_prime(new_capacity * 2)
+
+        # copy the nodes, readers may still be walking the old ones
+        new_buckets = self._new_buckets(new_capacity)
+        stripes = len(self._locks)
+        counts = [0] * stripes
+
+        for i in range(capacity):
+            for node in buckets[i]:
+                index = node.hash % new_capacity
+                new_buckets[index].insert(node.key, node.value, node.hash)
+                counts[index % stripes] += 1
+
+        self._counts = counts
+        self._table = (new_buckets, new_capacity)
+
+    def clear(self) -> None:
+        """
+        A method that removes every key from the hash table, keeping its capacity.
+        :return: None
+        """
+
+        self._acquire_all()
+
+        try:
+            capacity = self._table[1]
+            self._counts = [0] * len(self._locks)
+            self._table = (self._new_buckets(capacity), capacity)
+        finally:
+            self._release_all()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        A method that returns a DynamicArray of tuples with the key value pairs of the hash
+        table.  No lock is taken, so pairs changed while the buckets are being read may or
+        may not be included.
+        :return: DynamicArray
+        """
+
+        keys_values_arr = DynamicArray()
+        buckets, capacity = self._table
+
+        for i in range(capacity):
+            for node in buckets[i]:
+                keys_values_arr.append((node.key, node.value))
+
+        return keys_values_arr
+
+
+def find_mode(da: DynamicArray, threads: int = 4) -> (DynamicArray, int):
+    """
+    A function that takes as a parameter a DynamicArray and returns a tuple
+    containing a DynamicArray containing the value(s) that are the mode of
+    the parameter array and an integer representing the frequency of the mode.
+    The array is split between the given number of threads, which count the
+    values into one ConcurrentHashMap with increment().
+    :param da: DynamicArray
+    :param threads: integer
+    :return: tuple (DynamicArray, int)
+    """
+
+    map = ConcurrentHashMap()
+    length = da.length()
+
+    def count(start: int) -> None:
+        for i in range(start, length, threads):
+            map.increment(da[i])
+
+    workers = [Thread(target=count, args=(start,)) for start in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    # keys with the highest count, in the order the buckets hold them
+    max_frequency = None
+    mode_arr = DynamicArray()
+    key_value_list = map.get_keys_and_values()
+
+    for i in range(key_value_list.length()):
+        key, frequency = key_value_list[i]
+
+        if max_frequency is None or frequency > max_frequency:
+            max_frequency = frequency
+            mode_arr = DynamicArray()
+
+        if frequency == max_frequency:
+            mode_arr.append(key)
+
+    return mode_arr, max_frequency
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nConcurrentHashMap - put example 1")
+    print("---------------------------------")
+    m = ConcurrentHashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nConcurrentHashMap - increment from 8 threads")
+    print("--------------------------------------------")
+    m = ConcurrentHashMap(11, hash_function_2, stripes=8)
+
+    def work(thread: int) -> None:
+        for i in range(2000):
+            m.increment('key' + str(i % 100))
+            m.put_if_absent('thread' + str(thread), thread)
+            m.compute('total', lambda key, value: (value or 0) + 1)
+
+    workers = [Thread(target=work, args=(thread,)) for thread in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    print(m.get_size(), m.get_capacity(), m.get('key0'), m.get('key99'), m.get('total'))
+    print(all(m.get('thread' + str(thread)) == thread for thread in range(8)))
+
+    print("\nConcurrentHashMap - resize while reading")
+    print("----------------------------------------")
+    m = ConcurrentHashMap(11, hash_function_2)
+    for i in range(500):
+        m.put(str(i), i)
+    missing = []
+
+    def read() -> None:
+        for _ in range(20):
+            for i in range(500):
+                if m.get(str(i)) != i:
+                    missing.append(i)
+
+    readers = [Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for capacity in range(100, 2000, 150):
+        m.resize_table(capacity)
+    for reader in readers:
+        reader.join()
+    print(m.get_size(), m.get_capacity(), len(missing))
+
+    print("\nConcurrentHashMap - find_mode example 1")
+    print("---------------------------------------")
+    da = DynamicArray(["apple", "apple", "grape", "melon", "peach"])
+    mode, frequency = find_mode(da)
+    print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}")
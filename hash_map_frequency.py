@@ -0,0 +1,325 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Streaming frequency counter on top of the Separate Chaining HashMap,
+#              with the mode and the top-k keys available at any point
+
+from itertools import islice
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+from hash_map_sc import HashMap
+
+
+class _Group:
+    """
+    Keys that occur the same number of times, in the order they reached that
+    frequency.  Groups are linked in order of increasing frequency.
+    """
+
+    __slots__ = ('frequency', 'head', 'tail', 'prev', 'next')
+
+    def __init__(self, frequency: int) -> None:
+        """Initialize an empty group for a frequency"""
+        self.frequency = frequency
+        self.head = None
+        self.tail = None
+        self.prev = None
+        self.next = None
+
+
+class _Counted:
+    """
+    A key of the counter, linked to the other keys of its frequency group.
+    """
+
+    __slots__ = ('key', 'group', 'prev', 'next')
+
+    def __init__(self, key: str) -> None:
+        """Initialize a key that is not in any group yet"""
+        self.key = key
+        self.group = None
+        self.prev = None
+        self.next = None
+
+
+class FrequencyCounter:
+    """
+    Counts how many times each key occurs in a stream.
+    The HashMap maps every key to its entry in a list of frequency groups
+    (a stream-summary), ordered from the lowest to the highest frequency.
+    Counting a key moves it from its group to the next one, creating that
+    group if needed, in constant time, so the keys with the highest counts
+    can be read from the top groups without scanning the whole map.
+    """
+
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1) -> None:
+        """
+        Initialize new FrequencyCounter with an empty HashMap of the given
+        capacity and hash function
+        """
+        self._map = HashMap(capacity, function)
+        self._lowest = None
+        self._highest = None
+        self._total = 0
+
+    def get_size(self) -> int:
+        """
+        Return the number of distinct keys counted
+        """
+        return self._map.get_size()
+
+    def get_total(self) -> int:
+        """
+        Return the number of keys counted, with repetitions
+        """
+        return self._total
+
+    # ------------------------------------------------------------------ #
+
+    def _unlink(self, counted: _Counted) -> None:
+        """
+        A method that takes as a parameter a key entry and removes it from its group,
+        dropping the group if it becomes empty.
+        :param counted: _Counted
+        :return: None
+        """
+
+        group = counted.group
+
+        if counted.prev:
+            counted.prev.next = counted.next
+        else:
+            group.head = counted.next
+
+        if counted.next:
+            counted.next.prev = counted.prev
+        else:
+            group.tail = counted.prev
+
+        counted.prev = counted.next = None
+
+        if group.head is None:
+            if group.prev:
+                group.prev.next = group.next
+            else:
+                self._lowest = group.next
+
+            if group.next:
+                group.next.prev = group.prev
+            else:
+                self._highest = group.prev
+
+    def _link(self, counted: _Counted, group: _Group) -> None:
+        """
+        A method that takes as parameters a key entry and a group and appends the entry
+        to the keys of the group.
+        :param counted: _Counted
+        :param group: _Group
+        :return: None
+        """
+
+        counted.group = group
+        counted.prev = group.tail
+
+        if group.tail:
+            group.tail.next = counted
+        else:
+            group.head = counted
+
+        group.tail = counted
+
+    def add(self, key: str) -> int:
+        """
+        A method that takes as a parameter a key, counts one more occurrence of it and
+        returns its new frequency.  The key moves to the group of the next frequency,
+        which is created after its current group if it does not exist yet.
+        :param key: string
+        :return: integer
+        """
+
+        counted = self._map.get(key)
+        self._total += 1
+
+        # a new key joins the group of frequency 1, the lowest group if it exists
+        if counted is None:
+            counted = _Counted(key)
+            self._map.put(key, counted)
+
+            group = self._lowest
+            if group is None or group.frequency != 1:
+                group = _Group(1)
+                group.next = self._lowest
+
+                if self._lowest:
+                    self._lowest.prev = group
+                else:
+                    self._highest = group
+
+                self._lowest = group
+
+            self._link(counted, group)
+            return 1
+
+        current = counted.group
+        frequency = current.frequency + 1
+        group = current.next
+
+        # insert the group of the next frequency after the current group
+        if group is None or group.frequency != frequency:
+            group = _Group(frequency)
+            group.prev = current
+            group.next = current.next
+
+            if current.next:
+                current.next.prev = group
+            else:
+                self._highest = group
+
+            current.next = group
+
+        self._unlink(counted)
+        self._link(counted, group)
+
+        return frequency
+
+    def replace_lowest(self, key: str) -> int:
+        """
+        A method that takes as a parameter a key that is not counted yet, gives it the
+        entry of the first key of the lowest frequency group, which stops being counted,
+        and counts one occurrence of it, so it starts from the frequency of the replaced
+        key plus one.  Returns that frequency.  This is the Space-Saving replacement step
+        that keeps the number of distinct keys fixed.
+        :param key: string
+        :return: integer
+        """
+
+        counted = self._lowest.head
+        self._map.remove(counted.key)
+
+        counted.key = key
+        self._map.put(key, counted)
+
+        return self.add(key)
+
+    def update(self, iterable, chunk_size: int = 65536) -> None:
+        """
+        A method that takes as a parameter any iterable of keys, such as a generator over
+        the lines of a file, and counts every key.  The iterable is read chunk_size keys
+        at a time, so only one chunk is held in memory.
+        :param iterable: iterable of strings
+        :param chunk_size: integer
+        :return: None
+        """
+
+        iterator = iter(iterable)
+
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+
+            if not chunk:
+                break
+
+            for key in chunk:
+                self.add(key)
+
+    def frequency(self, key: str) -> int:
+        """
+        A method that takes as a parameter a key and returns the number of times
+        it has been counted.
+        :param key: string
+        :return: integer
+        """
+
+        counted = self._map.get(key)
+        return counted.group.frequency if counted else 0
+
+    def mode(self) -> (DynamicArray, int):
+        """
+        A method that returns a tuple containing a DynamicArray with the key(s) counted
+        most often, in the order they reached that frequency, and the frequency, or
+        an empty DynamicArray and None if nothing has been counted.
+        :return: tuple (DynamicArray, int)
+        """
+
+        mode_arr = DynamicArray()
+
+        if self._highest is None:
+            return mode_arr, None
+
+        counted = self._highest.head
+        while counted:
+            mode_arr.append(counted.key)
+            counted = counted.next
+
+        return mode_arr, self._highest.frequency
+
+    def top_k(self, k: int) -> DynamicArray:
+        """
+        A method that takes as a parameter a number k and returns a DynamicArray of
+        (key, frequency) tuples with the k keys counted most often, from the highest
+        frequency down.  Only the groups holding those keys are visited.
+        :param k: integer
+        :return: DynamicArray
+        """
+
+        top = DynamicArray()
+        group = self._highest
+
+        while group and top.length() < k:
+            counted = group.head
+
+            while counted and top.length() < k:
+                top.append((counted.key, group.frequency))
+                counted = counted.next
+
+            group = group.prev
+
+        return top
+
+
+def find_mode_stream(iterable, chunk_size: int = 65536,
+                     function: callable = hash_function_1) -> (DynamicArray, int):
+    """
+    A function that takes as a parameter any iterable of keys and returns a tuple
+    containing a DynamicArray with the value(s) that are the mode of the iterable
+    and an integer representing the frequency of the mode, reading the iterable
+    chunk_size keys at a time instead of requiring it as a DynamicArray.
+    :param iterable: iterable of strings
+    :param chunk_size: integer
+    :param function: hash function
+    :return: tuple (DynamicArray, int)
+    """
+
+    counter = FrequencyCounter(function=function)
+    counter.update(iterable, chunk_size)
+    return counter.mode()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nfind_mode_stream - example 1")
+    print("----------------------------")
+    mode, frequency = find_mode_stream(iter(["apple", "apple", "grape", "melon", "peach"]))
+    print(f"Mode : {mode}, Frequency: {frequency}")
+
+    print("\nfind_mode_stream - example 2")
+    print("----------------------------")
+    test_cases = (
+        ["Arch", "Manjaro", "Manjaro", "Mint", "Mint", "Mint", "Ubuntu", "Ubuntu", "Ubuntu"],
+        ["one", "two", "three", "four", "five"],
+        ["2", "4", "2", "6", "8", "4", "1", "3", "4", "5", "7", "3", "3", "2"]
+    )
+    for case in test_cases:
+        mode, frequency = find_mode_stream((key for key in case), chunk_size=4)
+        print(f"Input: {case}\nMode : {mode}, Frequency: {frequency}\n")
+
+    print("FrequencyCounter - top_k while counting")
+    print("---------------------------------------")
+    counter = FrequencyCounter(function=hash_function_2)
+    words = ("the quick brown fox jumps over the lazy dog the fox " * 3).split()
+    for i, word in enumerate(words):
+        counter.add(word)
+        if i % 10 == 9:
+            print(counter.get_total(), counter.get_size(), counter.top_k(3))
+    print(counter.frequency('fox'), counter.frequency('cat'))
@@ -0,0 +1,336 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Immutable Hash Map built from the pairs of an existing map, with a
+#              perfect hash function (CHD, compress-hash-displace) over packed
+#              key and value arrays
+
+from array import array
+from collections import Counter
+
+from a6_include import DynamicArray
+from hash_map_capacity import next_prime
+
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+# average number of keys per bucket of the displacement table
+_BUCKET_SIZE = 4
+
+# displacements tried for one bucket before the keys are hashed again with a new salt
+_MAX_ATTEMPTS = 1 << 20
+
+# salts tried before giving up on finding a displacement for every bucket
+_MAX_SALTS = 64
+
+
+class FrozenHashMap:
+    """
+    Read-only HashMap.  The pairs are stored in packed key and value arrays of
+    p slots, p the smallest odd prime >= n.  Every key is hashed to one of about
+    n / 4 buckets, and each bucket stores a displacement d = d0 * p + d1, chosen
+    when the map is built so that the slots (f1 + d0 * f2 + d1) % p of its keys
+    are free and distinct, with f1 and f2 derived from the two halves of the
+    hash.  Buckets holding a single key store the slot itself, as -slot - 1.
+    get and contains_key read one displacement and compare one key, so a lookup
+    costs the same for every key, present or not.
+    Keys are hashed with Python's built-in hash, whatever hash function the map
+    it was built from used, so a frozen map is only valid in the process that
+    built it and is not meant to be pickled.  Distinct keys with the same built-in
+    hash, such as -1 and -2, get the same slot under every salt, so they are kept
+    in a small dict instead, which tells them apart by equality.
+    """
+
+    def __init__(self, pairs=()) -> None:
+        """
+        Initialize a FrozenHashMap holding the given key-value pairs, where later pairs
+        replace earlier ones with the same key.  Raise ValueError if no displacement
+        table is found for the keys within _MAX_SALTS salts.
+        """
+        entries = {}
+        for key, value in pairs:
+            entries[key] = value
+
+        self._size = len(entries)
+
+        # salting the built-in hash cannot separate keys whose hashes are equal
+        counts = Counter(hash(key) for key in entries)
+        self._overflow = {key: entries.pop(key) for key in list(entries) if counts[hash(key)] > 1}
+
+        self._capacity = next_prime(len(entries)) if entries else 0
+        self._keys = list(entries)
+        self._values = list(entries.values())
+        self._displacements = array('q', [0])
+        self._salt = 0
+
+        # the keys are hashed again with a new salt until a displacement is found for every bucket
+        while entries and not self._build():
+            self._salt += 1
+
+            if self._salt == _MAX_SALTS:
+                raise ValueError(f"no perfect hash found for the keys in {_MAX_SALTS} salts")
+
+    def _hash(self, key: str) -> tuple:
+        """
+        A method that takes as a parameter a key and returns its bucket and the (f1, f2)
+        pair of its probe family, with f1 in [0, p) and f2 in [1, p).
+        :param key: string
+        :return: tuple (integer, (integer, integer))
+        """
+
+        hash_value = (hash(key) if not self._salt else hash((self._salt, key))) & _MASK_64
+        capacity = self._capacity
+
+        return (hash_value % len(self._displacements),
+                ((hash_value >> 32) % capacity, (hash_value & 0xFFFFFFFF) % (capacity - 1) + 1
+                 if capacity > 1 else 1))
+
+    def _build(self) -> bool:
+        """
+        A method that computes the displacement table for the keys and moves every pair
+        to its slot.  The buckets are placed from the largest down, each with a
+        displacement that sends its keys to free slots, then the buckets of a single key
+        take free slots in order.  Returns False if a bucket could not be placed, e.g.
+        because two of its keys have the same (f1, f2).
+        :return: boolean
+        """
+
+        capacity = self._capacity
+        bucket_count = -(-len(self._keys) // _BUCKET_SIZE)
+        self._displacements = displacements = array('q', bytes(8 * bucket_count))
+
+        # group the keys by bucket
+        buckets = [[] for _ in range(bucket_count)]
+        for i, key in enumerate(self._keys):
+            bucket, pair = self._hash(key)
+            buckets[bucket].append((i, pair))
+
+        slot_of = [0] * len(self._keys)
+        used = bytearray(capacity)
+        order = sorted(range(bucket_count), key=lambda bucket: -len(buckets[bucket]))
+
+        for bucket in order:
+            members = buckets[bucket]
+
+            if not members:
+                break
+
+            # a single key takes the first free slot
+            if len(members) == 1:
+                slot = used.find(0)
+                used[slot] = 1
+                slot_of[members[0][0]] = slot
+                displacements[bucket] = -slot - 1
+                continue
+
+            pairs = [pair for _, pair in members]
+
+            # keys with the same (f1, f2) can never be separated
+            if len(set(pairs)) < len(pairs):
+                return False
+
+            displacement = self._displace(pairs, used)
+
+            if displacement is None:
+                return False
+
+            d0, d1 = divmod(displacement, capacity)
+            displacements[bucket] = displacement
+
+            for i, (f1, f2) in members:
+                slot = (f1 + d0 * f2 + d1) % capacity
+                used[slot] = 1
+                slot_of[i] = slot
+
+        # move every pair to its slot
+        keys = [None] * capacity
+        values = [None] * capacity
+        for i, slot in enumerate(slot_of):
+            keys[slot] = self._keys[i]
+            values[slot] = self._values[i]
+
+        self._keys = keys
+        self._values = values
+        return True
+
+    def _displace(self, pairs: list, used: bytearray) -> int:
+        """
+        A method that takes as parameters the (f1, f2) pairs of the keys of a bucket and
+        the slots in use, and returns a displacement d0 * p + d1 that sends every key to
+        a free slot of its own, or None if none was found in _MAX_ATTEMPTS attempts.
+        For each d0, d1 is only tried at the values that send the first key to a free
+        slot, found with bytearray.find from the slot of the first key for d1 = 0, so
+        no attempt is wasted on the first key and the buckets spread over the table.
+        :param pairs: list of (integer, integer) tuples
+        :param used: bytearray
+        :return: integer
+        """
+
+        capacity = self._capacity
+        (first_f1, first_f2), others = pairs[0], pairs[1:]
+        attempts = 0
+
+        for d0 in range(capacity):
+            offset = (first_f1 + d0 * first_f2) % capacity
+
+            # free slots from the slot of the first key to the end, then from the start
+            for start, end in ((offset, capacity), (0, offset)):
+                slot = used.find(0, start, end)
+
+                while slot >= 0:
+                    d1 = (slot - offset) % capacity
+                    slots = {slot}
+
+                    for f1, f2 in others:
+                        other = (f1 + d0 * f2 + d1) % capacity
+
+                        if used[other] or other in slots:
+                            break
+
+                        slots.add(other)
+                    else:
+                        return d0 * capacity + d1
+
+                    attempts += 1
+                    if attempts == _MAX_ATTEMPTS:
+                        return None
+
+                    slot = used.find(0, slot + 1, end)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, the number of slots of the key and value arrays
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _slot(self, key: str) -> int:
+        """
+        A method that takes as a parameter a key and returns the only slot it can be in.
+        :param key: string
+        :return: integer
+        """
+
+        # same hash as _hash(), inlined as lookups are the hot path
+        hash_value = (hash(key) if not self._salt else hash((self._salt, key))) & _MASK_64
+        displacements = self._displacements
+        displacement = displacements[hash_value % len(displacements)]
+
+        if displacement < 0:
+            return -displacement - 1
+
+        capacity = self._capacity
+        d0, d1 = divmod(displacement, capacity)
+        f2 = (hash_value & 0xFFFFFFFF) % (capacity - 1) + 1 if capacity > 1 else 1
+
+        return ((hash_value >> 32) + d0 * f2 + d1) % capacity
+
+    def get(self, key: str) -> object:
+        """
+        A method that takes as a parameter a key and returns its value, or None if the
+        key is not in the map.
+        :param key: string
+        :return: object
+        """
+
+        if self._capacity:
+            slot = self._slot(key)
+
+            if self._keys[slot] == key:
+                return self._values[slot]
+
+        if self._overflow:
+            return self._overflow.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        A method that takes as a parameter a key and returns True if it is in the map
+        and False otherwise.
+        :param key: string
+        :return: boolean
+        """
+
+        if self._capacity and self._keys[self._slot(key)] == key:
+            return True
+
+        return key in self._overflow
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        A method that returns a DynamicArray of tuples with the key value pairs of the map.
+        :return: DynamicArray
+        """
+
+        return DynamicArray([(key, value) for key, value in zip(self._keys, self._values)
+                             if key is not None] + list(self._overflow.items()))
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import random
+    import sys
+    import time
+    import tracemalloc
+
+    import hash_map_oa
+    import hash_map_sc
+    from hash_functions import builtin_hash
+
+    print("\nFrozenHashMap - freeze example 1")
+    print("--------------------------------")
+    m = hash_map_sc.HashMap(11, hash_map_sc.hash_function_1)
+    for i in range(1, 6):
+        m.put(str(i), i * 10)
+    frozen = m.freeze()
+    print(frozen.get_size(), frozen.get('1'), frozen.get('5'), frozen.get('6'), frozen.contains_key('3'))
+
+    print("\nFrozenHashMap - keys with the same built-in hash")
+    print("-----------------------------------------------")
+    # hash(-1) == hash(-2) == -2, so no salt can give the two keys different slots
+    m = hash_map_sc.HashMap(11, builtin_hash)
+    for key, value in ((-1, 1), (-2, 2), (3, 3), (4, 4)):
+        m.put(key, value)
+    frozen = m.freeze()
+    print(frozen.get_size(), frozen.get(-1), frozen.get(-2), frozen.get(3), frozen.get(-3),
+          frozen.contains_key(-2), frozen.get_keys_and_values().length())
+
+    print("\nFrozenHashMap - memory and get against the mutable maps")
+    print("-------------------------------------------------------")
+    rnd = random.Random(5)
+    keys = ['key' + str(i) for i in range(100000)]
+    pairs = [(key, i) for i, key in enumerate(keys)]
+    lookups = [rnd.choice(keys) for _ in range(100000)] + ['missing' + str(i) for i in range(25000)]
+
+    for map_class in (hash_map_sc.HashMap, hash_map_oa.HashMap):
+        tracemalloc.start()
+        m = map_class(11, builtin_hash)
+        for key, value in pairs:
+            m.put(key, value)
+        map_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        frozen = m.freeze()
+        freeze_seconds = time.perf_counter() - start
+
+        # the keys and values are shared with the map, only the arrays are new
+        frozen_memory = (sys.getsizeof(frozen._keys) + sys.getsizeof(frozen._values)
+                         + sys.getsizeof(frozen._displacements))
+
+        start = time.perf_counter()
+        map_values = [m.get(key) for key in lookups]
+        map_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        frozen_values = [frozen.get(key) for key in lookups]
+        frozen_seconds = time.perf_counter() - start
+
+        print(f"{map_class.__module__}: freeze {freeze_seconds:.2f}s, {map_memory / 1e6:.1f} MB -> "
+              f"{frozen_memory / 1e6:.1f} MB, get {map_seconds:.2f}s -> {frozen_seconds:.2f}s "
+              f"{map_values == frozen_values}")
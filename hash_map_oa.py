@@ -5,27 +5,101 @@
 # Due Date: 03/17/2023
 # Description: This is the implementation of a Hash Map with Open addressing and Quadratic Probing
 
+from array import array
+from time import perf_counter
+
 from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
-                        hash_function_1, hash_function_2)
+                        hash_function_1, hash_function_2, hash_keys)
+from hash_functions import is_process_randomized, seeded
+from hash_map_capacity import CAPACITY_POLICIES, mixed, next_prime
+from hash_map_frozen import FrozenHashMap
+from hash_map_snapshot import CHUNK_SIZE, read_snapshot, write_snapshot
+from hash_map_stats import HashMapStats
+from hash_map_views import ItemsView, KeysView, ValuesView
+
+# placeholder left in the old buckets for the entries moved by an incremental resize
+_MIGRATED = HashEntry(None, None)
+_MIGRATED.is_tombstone = True
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    # load factor at which the table grows for each probing mode
+    _MAX_LOAD = {'quadratic': 0.5, 'robin_hood': 0.85}
+
+    def __init__(self, capacity: int, function, incremental_resize: int = 0,
+                 tombstone_threshold: float = 0.25, probing: str = 'quadratic',
+                 seed: int = None, stats: bool = False, capacity_policy: str = 'prime') -> None:
         """
         Initialize new HashMap that uses
-        quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        quadratic probing for collision resolution.
+        When incremental_resize is a positive number, growing the table keeps the old
+        buckets next to the new ones and every put, get, contains_key and remove moves
+        that many old buckets into the new table, instead of one put rehashing everything.
+        A remove that leaves tombstones in at least tombstone_threshold of the buckets,
+        or a put that finds the table full with that many tombstones, rebuilds the table
+        at the same capacity instead of growing it.
+        With probing='robin_hood' collisions are resolved by Robin Hood linear probing
+        with backward shift deletion instead, and the table grows at a load of 0.85.
+        When a seed is given the keys are hashed with the seeded variant of the hash
+        function (see hash_functions.seeded), e.g. seed=random_seed() for a per-map seed.
+        With stats=True the map records the statistics returned by get_stats().
+        capacity_policy chooses the capacities of the table (see hash_map_capacity):
+        'prime' for the next prime, 'prime_ladder' for a precomputed ladder of doubling
+        primes, or 'pow2' for powers of two, with the hashes mixed so their low bits
+        are usable and triangular instead of quadratic probing.
         """
-        self._buckets = DynamicArray()
+        if probing not in self._MAX_LOAD:
+            raise ValueError(f"unknown probing mode: {probing}")
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(None)
+        if capacity_policy not in CAPACITY_POLICIES:
+            raise ValueError(f"unknown capacity policy: {capacity_policy}")
 
-        self._hash_function = function
+        if probing == 'robin_hood' and incremental_resize > 0:
+            raise ValueError("robin_hood probing does not support incremental_resize")
+
+        self._buckets = DynamicArray()
+
+        # capacity must be allowed by the capacity policy
+        self._capacity_policy = capacity_policy
+        self._next_capacity = CAPACITY_POLICIES[capacity_policy]
+        self._capacity = self._next_capacity(capacity)
+        self._buckets.resize(self._capacity)
+
+        # probing moves j buckets further and then adds the step to j: with a step of 2
+        # the offsets are the squares 1, 4, 9, ..., which reach half of the buckets of a
+        # prime table, and with a step of 1 the triangular numbers 1, 3, 6, ..., which
+        # reach all the buckets of a power of two table
+        self._probe_step = 1 if capacity_policy == 'pow2' else 2
+
+        # a seed replaces the hash function with its seeded variant
+        self._function = function
+        self._seed = seed
+        self._hash_function = function if seed is None else seeded(function, seed)
         self._size = 0
 
+        # a power of two capacity only keeps the low bits of the hash
+        if capacity_policy == 'pow2':
+            self._hash_function = mixed(self._hash_function)
+
+        # number of buckets holding a tombstone
+        self._tombstones = 0
+        self._tombstone_threshold = tombstone_threshold
+
+        # state of an incremental resize in progress
+        self._incremental_resize = incremental_resize
+        self._old_buckets = None
+        self._migrate_index = 0
+
+        # number of times the buckets were rebuilt, checked by iterators
+        self._rebuilds = 0
+
+        self._probing = probing
+        self._robin_hood = probing == 'robin_hood'
+        self._max_load = self._MAX_LOAD[probing]
+
+        # counters of an instrumented map, None when statistics are disabled
+        self._stats = HashMapStats() if stats else None
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -88,81 +162,117 @@ class HashMap:
     def put(self, key: str, value: object) -> None:
         """
         A method that takes as parameters a key-value pair and inserts it into the hash table.
-        The method checks that the current load factor is less than or equal to 0.5 and if not,
-        calls the resize_table() method.  The method uses quadratic probing to search for either
-        an empty bucket, one that has a tombstone flag, or one with a matching key.
+        The method checks that the current load factor is less than or equal to 0.5 (0.85 with
+        Robin Hood probing) and if not, rebuilds the table at the same capacity when tombstones
+        hold at least tombstone_threshold of the buckets, or else calls the resize_table() method
+        or starts an incremental resize.  The method uses quadratic probing to search for either
+        an empty bucket or one with a matching key, and reuses the first bucket with a tombstone
+        flag it passed on the way.
         :param key: string
         :param value: object
         :return: None
         """
 
-        # check load factor of the hash table and call resize_table() if necessary
-        if self.table_load() >= 0.5:
-            self.resize_table(self._capacity * 2)
+        # check load factor of the hash table and resize if necessary
+        if self.table_load() >= self._max_load:
 
-        # calculate hash value and initial index value
-        hash_value = self._hash_function(key)
-        initial_index = hash_value % self._capacity
-        new_index = initial_index
-        j = 1
+            # buckets held by tombstones are reclaimed without growing the table
+            if self._tombstones >= self._tombstone_threshold * self._capacity:
+                self._compact()
+            elif self._incremental_resize > 0:
+                self._start_migration(self._capacity * 2)
+            else:
+                self.resize_table(self._capacity * 2)
+
+        hash_value = self._hash_function(key) if self._stats is None else self._record('put', key)
+        self._insert(key, value, hash_value)
+
+    def _insert(self, key: str, value: object, hash_value: int) -> None:
+        """
+        A method that takes as parameters a key-value pair and the hash of the key and
+        updates or inserts the key without checking the load factor of the hash table.
+        :param key: string
+        :param value: object
+        :param hash_value: integer
+        :return: None
+        """
 
-        # loop to traverse occupied buckets and check if they meet conditions to be updated
-        while self._buckets[new_index] is not None:
+        if self._robin_hood:
+            self._robin_hood_put(key, value, hash_value)
+            return
+
+        # while a resize is in progress the key may still be in the old buckets
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_resize)
+            entry = self._old_find(key, hash_value)
 
-            # matching key and not tombstone gets value updated without changing hash table size
-            if self._buckets[new_index].key == key and not self._buckets[new_index].is_tombstone:
-                self._buckets[new_index].value = value
+            if entry:
+                entry.value = value
                 return
 
-            # a bucket that is flagged as a tombstone gets replaced
-            if self._buckets[new_index].is_tombstone:
-                self._buckets[new_index] = HashEntry(key, value)
-                self._size += 1
+        # calculate initial index value, the buckets are read unchecked as every index is
+        # reduced modulo the capacity
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        step = self._probe_step
+        new_index = hash_value % capacity
+        tombstone_index = None
+        j = 1
+
+        # loop to traverse occupied buckets until the key or an empty bucket is found
+        while buckets[new_index] is not None:
+            entry = buckets[new_index]
+
+            # remember the first bucket flagged as a tombstone
+            if entry.is_tombstone:
+                if tombstone_index is None:
+                    tombstone_index = new_index
+
+            # matching hash and key gets value updated without changing hash table size
+            elif entry.hash == hash_value and entry.key == key:
+                entry.value = value
                 return
 
             # calculate next index
-            new_index = (initial_index + (j ** 2)) % self._capacity
-            j += 1
+            new_index = (new_index + j) % capacity
+            j += step
 
-        # if initial index bucket is empty create new hash entry
-        if self._buckets[initial_index] is None:
-            self._buckets[initial_index] = HashEntry(key, value)
-            self._size += 1
+        # a bucket that is flagged as a tombstone gets replaced
+        if tombstone_index is not None:
+            new_index = tombstone_index
+            self._tombstones -= 1
 
-        # if none of the occupied buckets could be updated or replaced create new hash entry in next open bucket
-        elif self._buckets[new_index] is None:
-            self._buckets[new_index] = HashEntry(key, value)
-            self._size += 1
+        # create new hash entry, caching the hash of the key
+        buckets[new_index] = HashEntry(key, value, hash_value)
+        self._size += 1
 
     def table_load(self) -> float:
         """
-        A method that return the current table load by dividing the number of elements in the table
-        by the number of buckets in the table.
+        A method that return the current table load by dividing the number of buckets in use,
+        by elements or by tombstones, by the number of buckets in the table.
         :return: float
         """
 
-        return self._size / self._capacity
+        return (self._size + self._tombstones) / self._capacity
 
     def empty_buckets(self) -> int:
         """
         A method that calculates and returns the number of empty buckets in the hash table
-        by taking the difference between the number of buckets and the number of elements
-        in the hash table.
+        by taking the difference between the number of buckets and the number of buckets
+        holding an element or a tombstone.
         :return: integer
         """
 
-        return self._capacity - self._size
+        return self._capacity - self._size - self._tombstones
 
     def resize_table(self, new_capacity: int) -> None:
         """
         A method that takes as a parameter an integer representing a new capacity
         and resizes the hash table based on this new capacity.  It starts by
         validating that the new capacity is greater than or equal to the current
-        hash table size.  Then it saves an array of the key value pairs, clears
-        the table, recalculates the table load and adjusts the capacity as necessary,
-        checks if the new capacity is prime and adjusts if necessary, adjusts number of
-        buckets based on capacity, and finally rehashes all the saved key value
-        pairs into the new hash table.
+        hash table size.  Then it checks if the new capacity is prime and adjusts
+        if necessary, and moves all the entries into the new hash table.
+        An incremental resize in progress is finished first.
         :param new_capacity: integer
         :return: None
         """
@@ -170,48 +280,283 @@ class HashMap:
         # validate new capacity
         if new_capacity >= self._size:
 
-            # preserve key value elements
-            old_buckets = self.get_keys_and_values()
-            capacity = self._capacity
+            self._finish_migration()
+            start = perf_counter()
 
-            # clear HashMap
-            self.clear()
+            # capacity must be allowed by the capacity policy
+            self._rehash(self._next_capacity(new_capacity))
 
-            # recalculate table load
-            table_load = self._size / new_capacity
+            if self._stats is not None:
+                self._stats.record_resize(perf_counter() - start)
 
-            # adjust capacity until table load is <= 0.5
-            while table_load > 0.5:
+    def _rehash(self, capacity: int) -> None:
+        """
+        A method that takes as a parameter a prime capacity, takes the entries that are
+        not tombstones out of the buckets, resizes the bucket array in place to that
+        capacity and empties it, and places the entries back directly.  Entries are placed
+        by the hash cached in them, so the hash function is not called again.  As when the
+        entries were re-put one by one, the table is doubled whenever the load factor
+        reaches 0.5 while the entries are being moved.
+        :param capacity: integer
+        :return: None
+        """
 
-                new_capacity = new_capacity * 2
+        # take the entries out and reuse the bucket array for the new capacity
+        entries = [entry for entry in self._buckets.unchecked()
+                   if entry is not None and not entry.is_tombstone]
+        self._buckets.resize(capacity)
+        self._buckets.fill(None)
+        self._capacity = capacity
+        self._size = 0
+        self._tombstones = 0
+        self._rebuilds += 1
 
-                if not self._is_prime(new_capacity):
-                    new_capacity = self._next_prime(new_capacity)
+        # move entries into the emptied hash table
+        for entry in entries:
 
-                table_load = self._size / new_capacity
+            if self.table_load() >= self._max_load:
+                self._rehash(self._next_capacity(self._capacity * 2))
 
-            # check if new capacity is prime and modify if necessary
-            # update capacity attribute
-            if self._is_prime(new_capacity):
-                self._capacity = new_capacity
-            else:
-                self._capacity = self._next_prime(new_capacity)
+            self._place(entry)
+            self._size += 1
 
-            # modify number of buckets based on the above
-            # add buckets
-            if self._capacity > capacity:
+    def _place(self, entry: HashEntry) -> None:
+        """
+        A method that takes as a parameter an entry whose key is not in the hash table
+        and stores it in the first empty bucket of the probe sequence of its cached hash.
+        :param entry: HashEntry
+        :return: None
+        """
 
-                for _ in range(capacity, self._capacity):
-                    self._buckets.append(None)
-            # remove buckets
-            else:
+        if self._robin_hood:
+            self._robin_hood_place(entry)
+            return
+
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        step = self._probe_step
+        new_index = entry.hash % capacity
+        j = 1
+
+        while buckets[new_index] is not None:
+            new_index = (new_index + j) % capacity
+            j += step
+
+        buckets[new_index] = entry
+
+    def _compact(self) -> None:
+        """
+        A method that rebuilds the hash table at its current capacity, dropping all the
+        tombstones.  An incremental resize in progress is finished first.
+        :return: None
+        """
+
+        self._finish_migration()
+        start = perf_counter()
+
+        self._rehash(self._capacity)
+
+        if self._stats is not None:
+            self._stats.record_resize(perf_counter() - start, compaction=True)
+
+    def _robin_hood_find(self, key: str, hash_value: int) -> int:
+        """
+        A method that takes as parameters a key and its hash value and returns the index
+        of the bucket holding the key with Robin Hood linear probing, or -1.  The search
+        stops at an empty bucket or at an entry closer to its home bucket than the key
+        would be, because inserting the key would have taken that bucket.
+        :param key: string
+        :param hash_value: integer
+        :return: integer
+        """
+
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        index = hash_value % capacity
+        distance = 0
+
+        while True:
+            entry = buckets[index]
+
+            if entry is None or (index - entry.hash) % capacity < distance:
+                return -1
+
+            if entry.hash == hash_value and entry.key == key:
+                return index
+
+            index = (index + 1) % capacity
+            distance += 1
+
+    def _robin_hood_place(self, entry: HashEntry) -> None:
+        """
+        A method that takes as a parameter an entry whose key is not in the hash table and
+        inserts it with Robin Hood linear probing.  Whenever the entry being placed is
+        further from its home bucket than the resident of a bucket, the two swap places
+        and the displaced resident continues the probe.
+        :param entry: HashEntry
+        :return: None
+        """
+
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        index = entry.hash % capacity
+        distance = 0
+
+        while buckets[index] is not None:
+            resident = buckets[index]
+            resident_distance = (index - resident.hash) % capacity
+
+            # take the bucket from a resident that is closer to its home bucket
+            if resident_distance < distance:
+                buckets[index] = entry
+                entry, distance = resident, resident_distance
+
+            index = (index + 1) % capacity
+            distance += 1
+
+        buckets[index] = entry
+
+    def _robin_hood_put(self, key: str, value: object, hash_value: int) -> None:
+        """
+        A method that takes as parameters a key-value pair and the hash of the key, and
+        updates the value of the key or inserts a new entry with Robin Hood linear probing.
+        :param key: string
+        :param value: object
+        :param hash_value: integer
+        :return: None
+        """
+
+        index = self._robin_hood_find(key, hash_value)
+
+        if index >= 0:
+            self._buckets.unchecked()[index].value = value
+        else:
+            self._robin_hood_place(HashEntry(key, value, hash_value))
+            self._size += 1
+
+    def _robin_hood_remove(self, key: str, hash_value: int) -> None:
+        """
+        A method that takes as parameters a key and its hash value and removes the key
+        with backward shift deletion: the entries that follow it are moved back by one
+        bucket until an empty bucket or an entry in its home bucket is reached, so no
+        tombstone is left behind.
+        :param key: string
+        :param hash_value: integer
+        :return: None
+        """
+
+        index = self._robin_hood_find(key, hash_value)
+
+        if index < 0:
+            return
+
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        next_index = (index + 1) % capacity
+
+        while buckets[next_index] is not None and (next_index - buckets[next_index].hash) % capacity > 0:
+            buckets[index] = buckets[next_index]
+            index = next_index
+            next_index = (next_index + 1) % capacity
+
+        buckets[index] = None
+        self._size -= 1
+
+    def _start_migration(self, new_capacity: int) -> None:
+        """
+        A method that takes as a parameter an integer representing a new capacity and
+        starts an incremental resize.  The current buckets become the old buckets
+        and entries are moved out of them by later calls to _migrate().
+        :param new_capacity: integer
+        :return: None
+        """
+
+        # only one resize can be in progress
+        self._finish_migration()
+        start = perf_counter()
+
+        self._old_buckets = self._buckets
+        self._migrate_index = 0
+
+        # capacity must be a prime number
+        self._capacity = self._next_capacity(new_capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._tombstones = 0
+        self._rebuilds += 1
+
+        if self._stats is not None:
+            self._stats.record_resize(perf_counter() - start)
+
+    def _migrate(self, count: int) -> None:
+        """
+        A method that takes as a parameter a number of old buckets and moves the entries
+        of that many old buckets into the new buckets.  Moved entries are replaced by a
+        tombstone so that the probe sequences of the old buckets stay intact, and the
+        old buckets are dropped once all of them have been moved.
+        :param count: integer
+        :return: None
+        """
+
+        start = perf_counter()
+        old_buckets = self._old_buckets
+        end = min(self._migrate_index + count, old_buckets.length())
+        old_entries = old_buckets.unchecked()
 
-                for _ in range(capacity - self._capacity):
-                    self._buckets.pop()
+        for i in range(self._migrate_index, end):
+            entry = old_entries[i]
 
-            # rehash values into new hash table
-            for i in range(old_buckets.length()):
-                self.put(old_buckets[i][0], old_buckets[i][1])
+            if entry is not None and not entry.is_tombstone:
+                self._place(entry)
+                old_entries[i] = _MIGRATED
+
+        self._migrate_index = end
+
+        if end == old_buckets.length():
+            self._old_buckets = None
+
+        if self._stats is not None:
+            self._stats.record_migration(perf_counter() - start)
+
+    def _finish_migration(self) -> None:
+        """
+        A method that moves all the remaining old buckets if an incremental resize
+        is in progress.
+        :return: None
+        """
+
+        if self._old_buckets is not None:
+            self._migrate(self._old_buckets.length())
+
+    def _old_find(self, key: str, hash_value: int) -> HashEntry:
+        """
+        A method that takes as parameters a key and its hash value and returns the entry
+        with that key if a resize is in progress and the key has not yet been moved out
+        of the old buckets, or None.
+        :param key: string
+        :param hash_value: integer
+        :return: HashEntry
+        """
+
+        old_buckets = self._old_buckets
+
+        if old_buckets is None:
+            return
+
+        capacity = old_buckets.length()
+        old_buckets = old_buckets.unchecked()
+        step = self._probe_step
+        new_index = hash_value % capacity
+        j = 1
+
+        # the old buckets may be more than half full, so stop once the probe sequence repeats
+        while old_buckets[new_index] is not None and j <= capacity:
+            entry = old_buckets[new_index]
+
+            if entry.hash == hash_value and entry.key == key and not entry.is_tombstone:
+                return entry
+
+            new_index = (new_index + j) % capacity
+            j += step
 
     def get(self, key: str) -> object:
         """
@@ -228,20 +573,14 @@ class HashMap:
         if self.get_size() == 0:
             return
 
-        # calculate hash value and initial index
-        hash_value = self._hash_function(key)
-        initial_index = hash_value % self._capacity
-        new_index = initial_index
-        j = 1
-
-        # loop through hash table until key is found
-        while self._buckets[new_index] is not None:
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_resize)
 
-            if self._buckets[new_index].key == key and not self._buckets[new_index].is_tombstone:
-                return self._buckets[new_index].value
+        hash_value = self._hash_function(key) if self._stats is None else self._record('get', key)
+        entry = self._find_entry(key, hash_value)
 
-            new_index = (initial_index + (j ** 2)) % self._capacity
-            j += 1
+        if entry:
+            return entry.value
 
     def contains_key(self, key: str) -> bool:
         """
@@ -257,23 +596,47 @@ class HashMap:
         if self.get_size() == 0:
             return False
 
-        # calculate hash value and initial index
-        hash_value = self._hash_function(key)
-        initial_index = hash_value % self._capacity
-        new_index = initial_index
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_resize)
+
+        # return False if key is not found
+        hash_value = self._hash_function(key) if self._stats is None else self._record('contains_key', key)
+        return self._find_entry(key, hash_value) is not None
+
+    def _find_entry(self, key: str, hash_value: int) -> HashEntry:
+        """
+        A method that takes as parameters a key and its hash value and returns the entry
+        holding the key, or None.  Quadratic probing is used if the key is not located
+        at the first bucket, and while a resize is in progress the old buckets are
+        searched as well.
+        :param key: string
+        :param hash_value: integer
+        :return: HashEntry
+        """
+
+        if self._robin_hood:
+            index = self._robin_hood_find(key, hash_value)
+            return self._buckets.unchecked()[index] if index >= 0 else None
+
+        # calculate initial index
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        step = self._probe_step
+        new_index = hash_value % capacity
         j = 1
 
-        # loop through hash table until key is found
-        while self._buckets[new_index] is not None:
+        # loop through hash table until key is found or the probe sequence repeats
+        while buckets[new_index] is not None and j <= capacity:
+            entry = buckets[new_index]
 
-            if self._buckets[new_index].key == key and not self._buckets[new_index].is_tombstone:
-                return True
+            if entry.hash == hash_value and entry.key == key and not entry.is_tombstone:
+                return entry
 
-            new_index = (initial_index + (j ** 2)) % self._capacity
-            j += 1
+            new_index = (new_index + j) % capacity
+            j += step
 
-        # return False if key is not found
-        return False
+        # the key may not have been moved out of the old buckets yet
+        return self._old_find(key, hash_value)
 
     def remove(self, key: str) -> None:
         """
@@ -282,43 +645,310 @@ class HashMap:
         is used if the key is not located at the first bucket.  If the key is found
         the method flags the hash entry as a tombstone and decrements the size
         attribute of the hash table.  If the key is not found the method does nothing.
+        When the tombstones reach the tombstone threshold the table is rebuilt.
+        With Robin Hood probing the key is removed with backward shift deletion.
         :param key: string
         :return: None
         """
 
-        if self.contains_key(key):
+        # check current size and return if empty
+        if self.get_size() == 0:
+            return
+
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_resize)
 
-            # calculate hash value and initial index
-            hash_value = self._hash_function(key)
-            initial_index = hash_value % self._capacity
-            new_index = initial_index
+        hash_value = self._hash_function(key) if self._stats is None else self._record('remove', key)
+        self._remove(key, hash_value)
+
+    def _remove(self, key: str, hash_value: int) -> None:
+        """
+        A method that takes as parameters a key and its hash value and removes the key
+        from the hash table if it is found.
+        :param key: string
+        :param hash_value: integer
+        :return: None
+        """
+
+        if self._robin_hood:
+            self._robin_hood_remove(key, hash_value)
+            return
+
+        # the key may not have been moved out of the old buckets yet
+        entry = self._old_find(key, hash_value)
+
+        if entry:
+            entry.is_tombstone = True
+            self._size -= 1
+            return
+
+        # calculate initial index
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        step = self._probe_step
+        new_index = hash_value % capacity
+        j = 1
+
+        # loop through hash table until key is found or the probe sequence repeats
+        while buckets[new_index] is not None and j <= capacity:
+            entry = buckets[new_index]
+
+            if entry.hash == hash_value and entry.key == key and not entry.is_tombstone:
+                entry.is_tombstone = True
+                self._size -= 1
+                self._tombstones += 1
+
+                # rebuild the table before tombstones make probe sequences too long
+                if self._tombstones >= self._tombstone_threshold * self._capacity:
+                    self._compact()
+
+                return
+
+            new_index = (new_index + j) % capacity
+            j += step
+
+    def put_many(self, pairs) -> None:
+        """
+        A method that takes as a parameter an iterable of key-value pairs and inserts them
+        into the hash table.  The table is resized at most once, before any pair is inserted,
+        to a capacity that keeps the table load under the resize threshold for all of them,
+        and the pairs are then inserted in a loop that skips the per-put load check.
+        :param pairs: iterable of (key, value) tuples
+        :return: None
+        """
+
+        if not isinstance(pairs, (list, tuple)):
+            pairs = list(pairs)
+
+        # size the table once for all the pairs, which also finishes a resize in progress
+        if (self._size + self._tombstones + len(pairs)) / self._capacity >= self._max_load:
+            self.resize_table(int((self._size + len(pairs)) / self._max_load) + 1)
+        else:
+            self._finish_migration()
+
+        hashes = self._hash_keys([pair[0] for pair in pairs])
+        insert = self._insert
+        stats = self._stats
+
+        for (key, value), hash_value in zip(pairs, hashes):
+            if stats is not None:
+                stats.record('put', self._probe_length(key, hash_value))
+
+            insert(key, value, hash_value)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        A method that takes as a parameter an iterable of keys and returns a DynamicArray
+        with the value of each key, or None for keys that are not in the hash table,
+        in the same order as the keys.
+        :param keys: iterable of strings
+        :return: DynamicArray
+        """
+
+        if not isinstance(keys, (list, tuple)):
+            keys = list(keys)
+
+        hashes = self._hash_keys(keys)
+        find_entry = self._find_entry
+        stats = self._stats
+        values = []
+
+        for key, hash_value in zip(keys, hashes):
+            if stats is not None:
+                stats.record('get', self._probe_length(key, hash_value))
+
+            entry = find_entry(key, hash_value)
+            values.append(entry.value if entry else None)
+
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> None:
+        """
+        A method that takes as a parameter an iterable of keys and removes each of them
+        from the hash table.  Keys that are not in the hash table are ignored.
+        :param keys: iterable of strings
+        :return: None
+        """
+
+        if not isinstance(keys, (list, tuple)):
+            keys = list(keys)
+
+        self._finish_migration()
+
+        hashes = self._hash_keys(keys)
+        remove = self._remove
+        stats = self._stats
+
+        for key, hash_value in zip(keys, hashes):
+            if stats is not None:
+                stats.record('remove', self._probe_length(key, hash_value))
+
+            remove(key, hash_value)
+
+    def _hash_keys(self, keys: list) -> list:
+        """
+        A method that takes as a parameter a list of keys and returns their hashes,
+        timing the hash function when statistics are enabled.
+        :param keys: list of strings
+        :return: list of integers
+        """
+
+        if self._stats is None:
+            return hash_keys(self._hash_function, keys)
+
+        return self._stats.hash_many(self._hash_function, keys)
+
+    def _record(self, operation: str, key: str) -> int:
+        """
+        A method that takes as parameters the name of an operation and a key, records the
+        time spent hashing the key and the number of probes of the operation, and returns
+        the hash value of the key.  Only called when statistics are enabled.
+        :param operation: string
+        :param key: string
+        :return: integer
+        """
+
+        hash_value = self._stats.hash(self._hash_function, key)
+        self._stats.record(operation, self._probe_length(key, hash_value))
+
+        return hash_value
+
+    def _probe_length(self, key: str, hash_value: int) -> int:
+        """
+        A method that takes as parameters a key and its hash value and returns the number
+        of buckets inspected by the probe sequence of the key until the key or an empty
+        bucket is found, in the new buckets and then in the old buckets of a resize in
+        progress.  With Robin Hood probing the search also stops at an entry closer to its
+        home bucket than the key would be.
+        :param key: string
+        :param hash_value: integer
+        :return: integer
+        """
+
+        if self._robin_hood:
+            capacity = self._capacity
+            index = hash_value % capacity
+            probes = 0
+
+            buckets = self._buckets.unchecked()
+
+            while probes <= capacity:
+                entry = buckets[index]
+                probes += 1
+
+                if entry is None or (index - entry.hash) % capacity < probes - 1:
+                    break
+
+                if entry.hash == hash_value and entry.key == key:
+                    break
+
+                index = (index + 1) % capacity
+
+            return probes
+
+        probes = 0
+
+        for buckets in (self._buckets, self._old_buckets):
+            if buckets is None:
+                continue
+
+            capacity = buckets.length()
+            buckets = buckets.unchecked()
+            index = hash_value % capacity
             j = 1
 
-            # loop through hash table until key is found
-            while self._buckets[new_index] is not None:
+            while True:
+                entry = buckets[index]
+                probes += 1
 
-                if self._buckets[new_index].key == key:
-                    self._buckets[new_index].is_tombstone = True
-                    self._size -= 1
-                    return
+                if entry is None or j > capacity:
+                    break
+
+                if entry.hash == hash_value and entry.key == key and not entry.is_tombstone:
+                    return probes
 
-                new_index = (initial_index + (j ** 2)) % self._capacity
-                j += 1
+                index = (index + j) % capacity
+                j += self._probe_step
+
+        return probes
+
+    def get_stats(self) -> dict:
+        """
+        A method that returns a dictionary describing the hash table: its size, capacity,
+        load, number of tombstones and the maximum and mean probe distance of its entries,
+        that is the number of buckets probed before the bucket holding an entry.  With
+        statistics enabled it also holds the probe counts of every operation, the number
+        and time of the hash function calls and the number and time of the resizes
+        (see HashMapStats.snapshot).
+        :return: dictionary
+        """
+
+        stats = self._stats.snapshot() if self._stats is not None else {}
+        total_distance, max_distance, entries = 0, 0, 0
+
+        for buckets in (self._old_buckets, self._buckets):
+            if buckets is None:
+                continue
+
+            capacity = buckets.length()
+
+            for i in range(capacity):
+                entry = buckets[i]
+
+                if entry is None or entry.is_tombstone:
+                    continue
+
+                # distance from the home bucket along the probe sequence
+                if self._robin_hood:
+                    distance = (i - entry.hash) % capacity
+                else:
+                    index = entry.hash % capacity
+                    distance = 0
+                    j = 1
+                    while index != i:
+                        index = (index + j) % capacity
+                        j += self._probe_step
+                        distance += 1
+
+                total_distance += distance
+                max_distance = max(max_distance, distance)
+                entries += 1
+
+        stats.update({
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'tombstones': self._tombstones,
+            'max_probe_distance': max_distance,
+            'mean_probe_distance': total_distance / entries if entries else 0.0,
+        })
+
+        return stats
 
     def clear(self) -> None:
         """
-        A method that reinitialized the hash map using its current capacity and hash function.
-        This method results in a cleared hash table of the same size.
+        A method that empties the hash table keeping its capacity, hash function and options.
+        The bucket array is emptied in place instead of being allocated again, and a resize
+        in progress is dropped with the old buckets.  The statistics start over.
         :return: None
         """
 
-        self.__init__(self._capacity, self._hash_function)
+        self._old_buckets = None
+        self._migrate_index = 0
+        self._buckets.fill(None)
+        self._size = 0
+        self._tombstones = 0
+        self._rebuilds += 1
+
+        if self._stats is not None:
+            self._stats = HashMapStats()
 
     def get_keys_and_values(self) -> DynamicArray:
         """
         A method that iterates through the hash table and copies buckets
         containing key value pairs that are not marked as tombstones
         into a new DynamicArray that is returned by the method.
+        While a resize is in progress the old buckets are copied as well.
         :return: DynamicArray
         """
 
@@ -326,43 +956,501 @@ class HashMap:
         keys_values_arr = DynamicArray()
 
         # loop through buckets and append tuples of valid key value pairs to new array
-        for i in range(self.get_capacity()):
+        for buckets in (self._old_buckets, self._buckets):
+            if buckets is None:
+                continue
 
-            if self._buckets[i] is not None and not self._buckets[i].is_tombstone:
-                keys_values_arr.append((self._buckets[i].key, self._buckets[i].value))
+            for i in range(buckets.length()):
+
+                if buckets[i] is not None and not buckets[i].is_tombstone:
+                    keys_values_arr.append((buckets[i].key, buckets[i].value))
 
         return keys_values_arr
 
     def __iter__(self):
         """
-        Returns an iterator object for the HashMap.
-        :return: self
+        Returns an iterator over the entries of the HashMap that are not tombstones.
+        Every call returns an independent generator, so loops over the same map can be
+        nested.  An incremental resize in progress is finished first, so lookups made
+        while iterating do not move entries, and a generator raises RuntimeError if the
+        table is resized while it is in use.
+        :return: generator
+        """
+
+        self._finish_migration()
+        rebuilds = self._rebuilds
+        entries = self._buckets.unchecked()
+
+        for i in range(self._capacity):
+
+            # the buckets are rebuilt by a resize, a compaction or clear
+            if self._rebuilds != rebuilds:
+                raise RuntimeError("HashMap resized during iteration")
+
+            entry = entries[i]
+
+            # skips empty and tombstone buckets
+            if entry is not None and not entry.is_tombstone:
+                yield entry
+
+    def _pairs(self):
+        """
+        A method that returns a generator over the (key, value) tuples of the hash table,
+        with the same checks as __iter__, read by the views.
+        :return: generator
+        """
+
+        return ((entry.key, entry.value) for entry in self)
+
+    def keys(self) -> KeysView:
+        """
+        A method that returns a view of the keys of the hash table, read lazily.
+        :return: KeysView
+        """
+
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        A method that returns a view of the values of the hash table, read lazily.
+        :return: ValuesView
+        """
+
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        A method that returns a view of the (key, value) tuples of the hash table, read lazily.
+        :return: ItemsView
+        """
+
+        return ItemsView(self)
+
+    def dump(self, path: str, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        A method that takes as a parameter a path and writes a binary snapshot of the
+        hash table to it: the capacity, the options of the map, and for every bucket in
+        use its index, the cached hash, key and value of its entry, written chunk_size
+        buckets at a time.  Tombstones are written as buckets without a key, so the probe
+        sequences that pass over them are unchanged after load().  An incremental resize
+        in progress is finished first.
+        :param path: string
+        :param chunk_size: integer
+        :return: None
+        """
+
+        self._finish_migration()
+
+        options = {'incremental_resize': self._incremental_resize,
+                   'tombstone_threshold': self._tombstone_threshold, 'probing': self._probing,
+                   'seed': self._seed, 'stats': self._stats is not None,
+                   'capacity_policy': self._capacity_policy}
+
+        def records():
+            buckets = self._buckets.unchecked()
+
+            for i in range(self._capacity):
+                entry = buckets[i]
+
+                if entry is None:
+                    continue
+
+                if entry.is_tombstone:
+                    yield i, None, None, None
+                else:
+                    yield i, entry.hash, entry.key, entry.value
+
+        write_snapshot(path, b'oa', self._capacity, self._size, self._function, options,
+                       records(), chunk_size)
+
+    @classmethod
+    def load(cls, path: str, function: callable = hash_function_1) -> "HashMap":
+        """
+        A method that takes as parameters the path of a snapshot written by dump() and
+        the hash function the map was created with, and returns a new map with the same
+        capacity and options.  Every entry and tombstone goes back to the bucket it was
+        dumped from with its cached hash, so no key is hashed and the table is not resized.
+        With a process-randomized hash function such as builtin_hash the keys are hashed
+        again instead, as their cached hashes are only valid in the process that dumped them.
+        :param path: string
+        :param function: hash function
+        :return: HashMap
+        """
+
+        capacity, size, options, records = read_snapshot(path, b'oa', function)
+        map = cls(capacity, function, **options)
+
+        # the constructor rounds the capacity through the capacity policy, but the entries
+        # were placed for the dumped capacity
+        if map._capacity != capacity:
+            map._buckets.resize(capacity)
+            map._capacity = capacity
+
+        # the cached hashes of a process-randomized hash function are only valid in the
+        # process that dumped them, so every key is hashed again
+        if is_process_randomized(function):
+            for _, hash_value, key, value in records:
+                if hash_value is not None:
+                    map.put(key, value)
+
+            # the puts of the load are not counted
+            if map._stats is not None:
+                map._stats = HashMapStats()
+
+            return map
+
+        buckets = map._buckets
+
+        for index, hash_value, key, value in records:
+            entry = HashEntry(key, value, hash_value)
+
+            if hash_value is None:
+                entry.is_tombstone = True
+                map._tombstones += 1
+
+            buckets[index] = entry
+
+        map._size = size
+        return map
+
+    def freeze(self) -> FrozenHashMap:
+        """
+        A method that returns an immutable FrozenHashMap with the key value pairs of the
+        hash table, whose get and contains_key compare a single key whatever the keys are,
+        and which stores the pairs in two packed arrays instead of one entry per pair.
+        An incremental resize in progress is finished first.
+        :return: FrozenHashMap
+        """
+
+        return FrozenHashMap((entry.key, entry.value) for entry in self)
+
+
+# slot states used by FlatHashMap
+_EMPTY = 0
+_LIVE = 1
+_TOMBSTONE = 2
+
+# the cached hashes of FlatHashMap are stored as unsigned 64-bit integers
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+class FlatHashMap:
+    """
+    HashMap with open addressing and quadratic probing that keeps its table
+    in parallel flat arrays instead of one HashEntry object per slot.
+    Keys and values are stored in plain lists, the cached hashes, masked to
+    64 bits, in an array('Q') and the state of every slot (empty, live or
+    tombstone) in a bytearray, so a probe only reads array items and no
+    per-entry objects are allocated.
+    It only has the core methods of HashMap: there is no seed, stats or
+    capacity_policy option, and no batch methods, views, get_stats, freeze,
+    dump or load.
+    """
+
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new FlatHashMap that uses
+        quadratic probing for collision resolution
+        """
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._allocate(self._capacity)
+
+        self._hash_function = function
+        self._size = 0
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        A method that replaces the parallel arrays with empty arrays
+        of the given length and resets the tombstone counter.
+        :param capacity: integer
+        :return: None
+        """
+
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+        self._tombstones = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as HashMap, except that
+        tombstones no longer hold their key
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == _EMPTY:
+                entry = 'None'
+            else:
+                entry = f"K: {self._keys[i]} V: {self._values[i]} TS: {self._states[i] == _TOMBSTONE}"
+            out += str(i) + ': ' + entry + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def _find(self, key: str, hash_value: int) -> int:
+        """
+        A method that takes as parameters a key and its hash value and probes
+        the table until it finds the live slot holding the key or an empty slot.
+        The cached hash of every live slot is compared before the key itself.
+        :param key: string
+        :param hash_value: integer
+        :return: index of the matching slot or -1 if the key is not in the table
+        """
+
+        states, keys, hashes = self._states, self._keys, self._hashes
+        capacity = self._capacity
+        initial_index = hash_value % capacity
+        index = initial_index
+        j = 1
+
+        # a probe sequence repeats itself after capacity steps
+        while states[index] != _EMPTY and j <= capacity:
+
+            if states[index] == _LIVE and hashes[index] == hash_value and keys[index] == key:
+                return index
+
+            index = (initial_index + j * j) % capacity
+            j += 1
+
+        return -1
+
+    def _place(self, key: str, value: object, hash_value: int) -> None:
+        """
+        A method that stores a key that is known not to be in the table
+        in the first empty slot of its probe sequence.
+        :param key: string
+        :param value: object
+        :param hash_value: integer
+        :return: None
+        """
+
+        states = self._states
+        capacity = self._capacity
+        initial_index = hash_value % capacity
+        index = initial_index
+        j = 1
+
+        while states[index] != _EMPTY:
+            index = (initial_index + j * j) % capacity
+            j += 1
+
+        states[index] = _LIVE
+        self._keys[index] = key
+        self._values[index] = value
+        self._hashes[index] = hash_value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        A method that takes as parameters a key-value pair and inserts it into the hash table.
+        When live entries and tombstones together fill half of the slots, the table is
+        resized if the live entries alone do, and rebuilt in place otherwise.  The probe
+        continues past tombstones so an existing key is always updated, and the first
+        tombstone met on the way is reused for a new key.
+        :param key: string
+        :param value: object
+        :return: None
+        """
+
+        # check load factor of the hash table and call resize_table() if necessary
+        if self.table_load() >= 0.5:
+
+            # purge tombstones so that every probe sequence still reaches an empty slot
+            if self._size * 2 < self._capacity:
+                self.resize_table(self._capacity)
+            else:
+                self.resize_table(self._capacity * 2)
+
+        hash_value = self._hash_function(key) & _MASK_64
+        states, keys, hashes = self._states, self._keys, self._hashes
+        capacity = self._capacity
+        initial_index = hash_value % capacity
+        index = initial_index
+        tombstone = -1
+        j = 1
+
+        while states[index] != _EMPTY:
+
+            # matching key gets value updated without changing hash table size
+            if states[index] == _LIVE:
+                if hashes[index] == hash_value and keys[index] == key:
+                    self._values[index] = value
+                    return
+
+            # remember the first tombstone so it can be reused
+            elif tombstone < 0:
+                tombstone = index
+
+            index = (initial_index + j * j) % capacity
+            j += 1
+
+        if tombstone >= 0:
+            index = tombstone
+            self._tombstones -= 1
+
+        states[index] = _LIVE
+        keys[index] = key
+        self._values[index] = value
+        hashes[index] = hash_value
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        A method that return the current table load by dividing the number of elements in the table,
+        counting the tombstones as HashMap does, by the number of buckets in the table.
+        :return: float
         """
 
-        self._index = 0
+        return (self._size + self._tombstones) / self._capacity
 
-        return self
+    def empty_buckets(self) -> int:
+        """
+        A method that returns the number of buckets that hold neither a live element nor a
+        tombstone, as HashMap does.
+        :return: integer
+        """
+
+        return self._capacity - self._size - self._tombstones
 
-    def __next__(self):
+    def resize_table(self, new_capacity: int) -> None:
         """
-        Returns the next item in the HashMap.  If the index is less than the capacity
-        and the index is None or has a tombstone flag this method increments to the
-        next index until either the next item is found ir a StopIteration is raised.
-        :return: value object
+        A method that takes as a parameter an integer representing a new capacity
+        and resizes the hash table following the same capacity rules as HashMap.
+        Live entries are moved to the new arrays using their cached hashes,
+        so the hash function is not called again and tombstones are dropped.
+        :param new_capacity: integer
+        :return: None
         """
 
-        # checks that index is less than capacity and skips empty and tombstone buckets
-        while self._index < self._capacity and (self._buckets[self._index] is None or self._buckets[self._index].is_tombstone):
-            self._index += 1
+        # validate new capacity
+        if new_capacity < self._size:
+            return
+
+        # capacity must be a prime number
+        self._rehash(next_prime(new_capacity))
+
+    def _rehash(self, capacity: int) -> None:
+        """
+        A method that moves the live entries into new arrays of the given capacity.
+        Like the re-put loop of HashMap.resize_table, the table doubles again whenever
+        the load factor reaches 0.5 while entries are being moved, so both maps end up
+        with the same capacity.
+        :param capacity: integer
+        :return: None
+        """
 
-        if self._index == self._capacity:
-            raise StopIteration
+        # preserve the current arrays and allocate the new ones
+        keys, values, hashes, states = self._keys, self._values, self._hashes, self._states
+        self._capacity = capacity
+        self._allocate(capacity)
+        self._size = 0
 
-        # assigns value and increments index
-        value = self._buckets[self._index]
-        self._index += 1
+        # move live entries into the new arrays
+        for i in range(len(states)):
+            if states[i] == _LIVE:
 
-        return value
+                if self.table_load() >= 0.5:
+                    self._rehash(next_prime(self._capacity * 2))
+
+                self._place(keys[i], values[i], hashes[i])
+                self._size += 1
+
+    def get(self, key: str) -> object:
+        """
+        A method that takes as a parameter a key and returns its value,
+        or None if the key is not in the hash table.
+        :param key: string
+        :return: object
+        """
+
+        if self._size == 0:
+            return
+
+        index = self._find(key, self._hash_function(key) & _MASK_64)
+        if index >= 0:
+            return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        A method that takes as a parameter a key and returns True if the key
+        is in the hash table and False otherwise.
+        :param key: string
+        :return: boolean
+        """
+
+        if self._size == 0:
+            return False
+
+        return self._find(key, self._hash_function(key) & _MASK_64) >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        A method that takes as a parameter a key and, if the key is found,
+        marks its slot as a tombstone and decrements the size of the hash table.
+        If the key is not found the method does nothing.
+        :param key: string
+        :return: None
+        """
+
+        if self._size == 0:
+            return
+
+        index = self._find(key, self._hash_function(key) & _MASK_64)
+        if index >= 0:
+            self._states[index] = _TOMBSTONE
+            self._keys[index] = None
+            self._values[index] = None
+            self._tombstones += 1
+            self._size -= 1
+
+    def clear(self) -> None:
+        """
+        A method that empties the hash table keeping its current capacity.
+        :return: None
+        """
+
+        self._allocate(self._capacity)
+        self._size = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        A method that returns a DynamicArray of tuples with the key value pairs
+        of all the live slots of the hash table.
+        :return: DynamicArray
+        """
+
+        keys_values_arr = DynamicArray()
+        states, keys, values = self._states, self._keys, self._values
+
+        for i in range(self._capacity):
+            if states[i] == _LIVE:
+                keys_values_arr.append((keys[i], values[i]))
+
+        return keys_values_arr
+
+    def __iter__(self):
+        """
+        Returns a generator over the (key, value) pairs of the live slots of the hash
+        table, read from the parallel arrays as there is no entry object to yield.
+        :return: generator
+        """
+
+        states, keys, values = self._states, self._keys, self._values
+
+        for i in range(self._capacity):
+            if states[i] == _LIVE:
+                yield keys[i], values[i]
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -573,3 +1661,22 @@ if __name__ == "__main__":
     print(m)
     for item in m:
         print('K:', item.key, 'V:', item.value)
+
+    print("\nFlatHashMap - put example 1")
+    print("---------------------------")
+    m = FlatHashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nFlatHashMap - remove example 1")
+    print("------------------------------")
+    m = FlatHashMap(11, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for key, value in m:
+        print('K:', key, 'V:', value)
@@ -0,0 +1,352 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Read-only Hash Map with Open Addressing and Quadratic Probing whose
+#              table lives in a memory-mapped file, so it can be opened without
+#              being rebuilt and shared between processes
+
+import mmap
+import os
+import pickle
+import struct
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+from hash_functions import is_process_randomized
+from hash_map_capacity import next_prime
+from hash_map_oa import HashMap
+
+# file header: magic, version, capacity, size, hash function name
+_MAGIC = b'HMAPOA01'
+_HEADER = struct.Struct('<8sIQQ64s')
+
+# slot: hash, key offset, value offset, key length, value length, state
+_SLOT = struct.Struct('<QQQIIB7x')
+_STATE_OFFSET = 32
+
+# slot states
+_EMPTY = 0
+_LIVE = 1
+
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _function_name(function) -> bytes:
+    """Return the name of a hash function as stored in the header"""
+    return getattr(function, '__name__', '').encode('utf-8')[:64]
+
+
+def _check_function(function) -> None:
+    """
+    Raise ValueError if a table cannot be stored with a hash function: the hashes of a
+    process-randomized function differ in the processes that open the table, and those
+    of a seeded or mixed variant depend on state its name, checked on open, does not hold.
+    """
+    name = getattr(function, '__name__', function)
+
+    if is_process_randomized(function):
+        raise ValueError(f"hash function differs between processes: {name}")
+
+    if getattr(function, '__closure__', None) is not None:
+        raise ValueError(f"hash function must be a module-level function: {name}")
+
+
+class PersistentHashMap:
+    """
+    HashMap with open addressing and quadratic probing stored in a file with
+    a fixed binary layout: a header, then `capacity` slots of
+    (hash, key offset, value offset, key length, value length, state), then
+    the UTF-8 keys and pickled values the slots point to.  Opening a table
+    maps the file into memory and reads nothing else, so get and contains_key
+    can be served immediately; the operating system loads the pages a lookup
+    touches on demand, and processes that open the same file share them.
+    Tables are written once by build() or build_from_map() and are read-only.
+    Values are unpickled when they are read, so only open trusted files.
+    """
+
+    def __init__(self, path: str, function: callable = hash_function_1) -> None:
+        """
+        Open the table stored in a file, read-only.  The hash function must be
+        the one the table was built with, and is checked against its name.
+        """
+        _check_function(function)
+
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, _, capacity, size, name = _HEADER.unpack_from(self._mmap, 0)
+
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"not a persistent hash map file: {path}")
+
+        name = name.rstrip(b'\0')
+        if name != _function_name(function):
+            self._mmap.close()
+            raise ValueError(f"table was built with hash function {name.decode()}")
+
+        self._hash_function = function
+        self._capacity = capacity
+        self._size = size
+
+    def __enter__(self) -> "PersistentHashMap":
+        """Return the map when used as a context manager"""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Unmap the file when leaving the context"""
+        self.close()
+
+    def close(self) -> None:
+        """
+        A method that unmaps the file.  The map cannot be used afterwards.
+        :return: None
+        """
+
+        self._mmap.close()
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def table_load(self) -> float:
+        """
+        A method that returns the current hash table load factor.
+        :return: float
+        """
+
+        return self._size / self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def build(cls, path: str, pairs, function: callable = hash_function_1) -> None:
+        """
+        A method that takes as parameters a path, an iterable of key-value pairs and a hash
+        function, and writes a table holding the pairs to the path.  Later pairs replace
+        earlier ones with the same key.  The file is written next to the path and renamed
+        over it when complete, so processes that have the old file open are not affected.
+        :param path: string
+        :param pairs: iterable of (key, value) tuples
+        :param function: hash function
+        :return: None
+        """
+
+        _check_function(function)
+
+        entries = {}
+        for key, value in pairs:
+            entries[key] = (function(key), value)
+
+        cls._write(path, ((key, hash_value, value) for key, (hash_value, value) in entries.items()),
+                   len(entries), function)
+
+    @classmethod
+    def build_from_map(cls, path: str, map: HashMap) -> None:
+        """
+        A method that takes as parameters a path and an open addressing HashMap and writes a
+        table with the same pairs and hash function to the path, using the hashes cached in
+        the entries of the map so no key is hashed again.  The keys of a map with a seed or
+        the 'pow2' capacity policy are hashed again with its plain hash function, as the
+        table is opened with that function.
+        :param path: string
+        :param map: HashMap
+        :return: None
+        """
+
+        function = map._function
+        _check_function(function)
+
+        # the cached hashes are those of the seeded or mixed variant of the function
+        if map._hash_function is not function:
+            entries = ((entry.key, function(entry.key), entry.value) for entry in map)
+        else:
+            entries = ((entry.key, entry.hash, entry.value) for entry in map)
+
+        cls._write(path, entries, map.get_size(), function)
+
+    @classmethod
+    def _write(cls, path: str, entries, size: int, function: callable) -> None:
+        """
+        A method that takes as parameters a path, an iterable of (key, hash, value) tuples
+        with distinct keys, their number and the hash function, and writes the table file.
+        The capacity is the prime above twice the size, so the load factor stays under 0.5
+        as in HashMap, and every entry takes the first empty slot of its probe sequence.
+        Keys and values are written to the file as they come, only the slots are kept in
+        memory.
+        :param path: string
+        :param entries: iterable of (string, integer, object) tuples
+        :param size: integer
+        :param function: hash function
+        :return: None
+        """
+
+        capacity = next_prime(2 * size + 1)
+        slots = bytearray(_SLOT.size * capacity)
+        offset = _HEADER.size + len(slots)
+        temporary_path = path + '.tmp'
+
+        with open(temporary_path, 'wb') as file:
+            file.seek(offset)
+
+            for key, hash_value, value in entries:
+                hash_value &= _MASK_64
+                key_bytes = key.encode('utf-8', 'surrogatepass')
+                value_bytes = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+                # quadratic probing for the first empty slot
+                initial_index = hash_value % capacity
+                index = initial_index
+                j = 1
+
+                while slots[index * _SLOT.size + _STATE_OFFSET] != _EMPTY:
+                    index = (initial_index + j ** 2) % capacity
+                    j += 1
+
+                _SLOT.pack_into(slots, index * _SLOT.size, hash_value, offset, offset + len(key_bytes),
+                                len(key_bytes), len(value_bytes), _LIVE)
+
+                file.write(key_bytes)
+                file.write(value_bytes)
+                offset += len(key_bytes) + len(value_bytes)
+
+            file.seek(0)
+            file.write(_HEADER.pack(_MAGIC, 1, capacity, size, _function_name(function)))
+            file.write(slots)
+
+        os.replace(temporary_path, path)
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str) -> tuple:
+        """
+        A method that takes as a parameter a key and returns the slot holding the key,
+        as a tuple (hash, key offset, value offset, key length, value length, state),
+        or None.  Quadratic probing is used until an empty slot is found or the probe
+        sequence repeats.
+        :param key: string
+        :return: tuple
+        """
+
+        hash_value = self._hash_function(key) & _MASK_64
+        key_bytes = key.encode('utf-8', 'surrogatepass')
+        buffer = self._mmap
+        capacity = self._capacity
+
+        initial_index = hash_value % capacity
+        index = initial_index
+        j = 1
+
+        while j <= capacity:
+            slot = _SLOT.unpack_from(buffer, _HEADER.size + index * _SLOT.size)
+
+            if slot[5] == _EMPTY:
+                return None
+
+            if (slot[0] == hash_value and slot[3] == len(key_bytes)
+                    and buffer[slot[1]:slot[1] + slot[3]] == key_bytes):
+                return slot
+
+            index = (initial_index + j ** 2) % capacity
+            j += 1
+
+    def get(self, key: str) -> object:
+        """
+        A method that takes as a parameter a key and returns its value, or None if the key
+        is not in the table.  Only the value of the key is unpickled.
+        :param key: string
+        :return: object
+        """
+
+        slot = self._find(key)
+
+        if slot:
+            return pickle.loads(self._mmap[slot[2]:slot[2] + slot[4]])
+
+    def contains_key(self, key: str) -> bool:
+        """
+        A method that takes as a parameter a key and returns True if it is in the table
+        and False otherwise, without reading its value.
+        :param key: string
+        :return: boolean
+        """
+
+        return self._find(key) is not None
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        A method that returns a DynamicArray of tuples with the key value pairs
+        of all the live slots of the table.
+        :return: DynamicArray
+        """
+
+        keys_values_arr = DynamicArray()
+        buffer = self._mmap
+
+        for index in range(self._capacity):
+            slot = _SLOT.unpack_from(buffer, _HEADER.size + index * _SLOT.size)
+
+            if slot[5] == _LIVE:
+                key = buffer[slot[1]:slot[1] + slot[3]].decode('utf-8', 'surrogatepass')
+                keys_values_arr.append((key, pickle.loads(buffer[slot[2]:slot[2] + slot[4]])))
+
+        return keys_values_arr
+
+
+def _lookup_in_process(path: str, function: callable, key: str) -> object:
+    """Open a table in a worker process and return the value of a key"""
+    with PersistentHashMap(path, function) as table:
+        return table.get(key)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from multiprocessing import Pool
+
+    from hash_functions import fnv1a_hash
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'table.hmap')
+
+    print("\nPersistentHashMap - build and get example 1")
+    print("-------------------------------------------")
+    PersistentHashMap.build(path, [(str(i), i * 10) for i in range(1, 6)], hash_function_2)
+    with PersistentHashMap(path, hash_function_2) as m:
+        print(m.get_size(), m.get_capacity(), m.get('1'), m.get('5'), m.get('6'), m.contains_key('3'))
+        print(m.get_keys_and_values())
+
+    print("\nPersistentHashMap - build_from_map example 1")
+    print("--------------------------------------------")
+    m = HashMap(11, fnv1a_hash)
+    for i in range(100000):
+        m.put('key' + str(i), {'id': i})
+    m.remove('key0')
+
+    start = time.perf_counter()
+    PersistentHashMap.build_from_map(path, m)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = PersistentHashMap(path, fnv1a_hash)
+    open_seconds = time.perf_counter() - start
+
+    print(table.get_size(), table.get('key1'), table.get('key0'), table.contains_key('key99999'))
+    print(f"built in {build_seconds:.2f}s, opened in {open_seconds * 1000:.2f}ms,"
+          f" {os.path.getsize(path) / 1e6:.1f} MB")
+
+    print("\nPersistentHashMap - shared by 4 processes")
+    print("-----------------------------------------")
+
+    with Pool(4) as pool:
+        results = pool.starmap(_lookup_in_process, [(path, fnv1a_hash, 'key' + str(i)) for i in (1, 2, 3, 4)])
+    print(results)
+    table.close()
@@ -5,29 +5,90 @@
 # Due Date: 03/17/2023
 # Description: This is the implementation of a Hash Map with Separate Chaining
 
-from a6_include import (DynamicArray, LinkedList,
-                        hash_function_1, hash_function_2)
+from time import perf_counter
+
+from a6_include import (DynamicArray, LinkedList, SLNode,
+                        hash_function_1, hash_function_2, hash_keys)
+from hash_functions import is_process_randomized, seeded
+from hash_map_buckets import ArrayBucket
+from hash_map_capacity import CAPACITY_POLICIES, is_prime, mixed
+from hash_map_frozen import FrozenHashMap
+from hash_map_snapshot import CHUNK_SIZE, read_snapshot, write_snapshot
+from hash_map_stats import HashMapStats
+from hash_map_tree import TREEIFY_THRESHOLD, UNTREEIFY_THRESHOLD, TreeBucket
+from hash_map_views import ItemsView, KeysView, ValuesView
 
 
 class HashMap:
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 incremental_resize: int = 0,
+                 seed: int = None,
+                 stats: bool = False,
+                 capacity_policy: str = 'prime',
+                 buckets: str = 'linked') -> None:
         """
         Initialize new HashMap that uses
-        separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        separate chaining for collision resolution.
+        When incremental_resize is a positive number, growing the table keeps the old
+        buckets next to the new ones and every put, get, contains_key and remove moves
+        that many old buckets into the new table, instead of one put rehashing everything.
+        When a seed is given the keys are hashed with the seeded variant of the hash
+        function (see hash_functions.seeded), e.g. seed=random_seed() for a per-map seed.
+        With stats=True the map records the statistics returned by get_stats().
+        capacity_policy chooses the capacities of the table (see hash_map_capacity):
+        'prime' for the next prime, 'prime_ladder' for a precomputed ladder of doubling
+        primes, or 'pow2' for powers of two, with the hashes mixed so their low bits
+        are usable.
+        A chain longer than TREEIFY_THRESHOLD is replaced by a TreeBucket searched by
+        binary search, and goes back to a linked list when it shrinks below
+        UNTREEIFY_THRESHOLD (see hash_map_tree).
+        With buckets='array' every bucket is an ArrayBucket that stores the hashes, keys
+        and values of its pairs in one list instead of a linked list of nodes, and chains
+        are not treeified (see hash_map_buckets).
         """
-        self._buckets = DynamicArray()
+        if capacity_policy not in CAPACITY_POLICIES:
+            raise ValueError(f"unknown capacity policy: {capacity_policy}")
+
+        if buckets not in ('linked', 'array'):
+            raise ValueError(f"unknown bucket type: {buckets}")
+
+        if buckets == 'array' and incremental_resize > 0:
+            raise ValueError("array buckets do not support incremental_resize")
+
+        self._bucket_type = buckets
+        self._array_buckets = buckets == 'array'
+        bucket_class = ArrayBucket if self._array_buckets else LinkedList
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        # capacity must be allowed by the capacity policy
+        self._capacity_policy = capacity_policy
+        self._next_capacity = CAPACITY_POLICIES[capacity_policy]
+        self._capacity = self._next_capacity(capacity)
+        self._buckets = DynamicArray([bucket_class() for _ in range(self._capacity)])
 
-        self._hash_function = function
+        # a seed replaces the hash function with its seeded variant
+        self._function = function
+        self._seed = seed
+        self._hash_function = function if seed is None else seeded(function, seed)
         self._size = 0
 
+        # a power of two capacity only keeps the low bits of the hash
+        if capacity_policy == 'pow2':
+            self._hash_function = mixed(self._hash_function)
+
+        # state of an incremental resize in progress
+        self._incremental_resize = incremental_resize
+        self._old_buckets = None
+        self._migrate_index = 0
+        self._fill_index = 0
+
+        # number of times the buckets were rebuilt, checked by iterators
+        self._rebuilds = 0
+
+        # counters of an instrumented map, None when statistics are disabled
+        self._stats = HashMapStats() if stats else None
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -91,40 +152,134 @@ class HashMap:
         """
         A method that takes as parameters a key-value pair and inserts it into the hash table.
         The method checks that the current load factor is less than or equal to 1.0 and if not,
-        calls the resize_table() method.  The method uses separate chaining and checks if the
-        linked list at the index already has the key being inserted and updates its value.
-        If the key is not in the linked list the new key value pair is inserted/
+        calls the resize_table() method, or starts an incremental resize.  The method uses
+        separate chaining and checks if the linked list at the index already has the key being
+        inserted and updates its value.  If the key is not in the linked list the new key value
+        pair is inserted.
         :param key: string
         :param value: object
         :return: None
         """
 
-        # check load factor of the hash table and call resize_table() if necessary
+        # check load factor of the hash table and resize if necessary
         if self.table_load() >= 1.0:
-            self.resize_table(self._capacity * 2)
-
-        # calculate hash value and initial index value
-        hash_value = self._hash_function(key)
-        initial_index = hash_value % self._buckets.length()
-        ll_at_index = self._buckets[initial_index]
-        key_at_index = ll_at_index.contains(key)
+            if self._incremental_resize > 0:
+                self._start_migration(self._capacity * 2)
+            else:
+                self.resize_table(self._capacity * 2)
+
+        # calculate hash value
+        hash_value = self._hash_function(key) if self._stats is None else self._record('put', key)
+
+        # an array bucket updates or adds the pair in place
+        if self._array_buckets:
+            if self._buckets.unchecked()[hash_value % self._capacity].put(key, value, hash_value):
+                self._size += 1
+            return
+
+        # while a resize is in progress the key may still be in the old buckets
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_resize)
+            key_at_index = self._old_contains(key, hash_value)
+
+            if key_at_index:
+                key_at_index.value = value
+                return
+
+        # calculate initial index value, the buckets are read unchecked as the index is
+        # reduced modulo the capacity
+        buckets = self._buckets.unchecked()
+        initial_index = hash_value % self._capacity
+        ll_at_index = buckets[initial_index]
+
+        # buckets of a table that is being filled by a resize are created on demand
+        if ll_at_index is None:
+            ll_at_index = LinkedList()
+            buckets[initial_index] = ll_at_index
+
+        key_at_index = ll_at_index.contains(key, hash_value)
 
         # if the key already exists the value is updated otherwise the new key value pair is inserted
+        # together with its hash
         if key_at_index:
             key_at_index.value = value
 
         else:
-            ll_at_index.insert(key, value)
+            ll_at_index.insert(key, value, hash_value)
             self._size += 1
 
+            # a chain that grows too long is treeified
+            if ll_at_index.length() > TREEIFY_THRESHOLD and isinstance(ll_at_index, LinkedList):
+                self._treeify(buckets, initial_index)
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        A method that takes as parameters a key and an amount, adds the amount to the value
+        of the key, or inserts the key with the amount as its value if it is not in the hash
+        table, and returns the new value.  Unlike a get followed by a put, the key is hashed
+        and its chain is walked only once.  The table is resized exactly as put would.
+        :param key: string
+        :param delta: integer
+        :return: integer
+        """
+
+        # check load factor of the hash table and resize if necessary
+        if self.table_load() >= 1.0:
+            if self._incremental_resize > 0:
+                self._start_migration(self._capacity * 2)
+            else:
+                self.resize_table(self._capacity * 2)
+
+        hash_value = self._hash_function(key) if self._stats is None else self._record('put', key)
+
+        if self._array_buckets:
+            value, added = self._buckets.unchecked()[hash_value % self._capacity].increment(
+                key, delta, hash_value)
+            self._size += added
+            return value
+
+        # while a resize is in progress the key may still be in the old buckets
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_resize)
+            node = self._old_contains(key, hash_value)
+
+            if node:
+                node.value += delta
+                return node.value
+
+        buckets = self._buckets.unchecked()
+        index = hash_value % self._capacity
+        bucket = buckets[index]
+
+        # buckets of a table that is being filled by a resize are created on demand
+        if bucket is None:
+            bucket = LinkedList()
+            buckets[index] = bucket
+
+        node = bucket.contains(key, hash_value)
+
+        if node:
+            node.value += delta
+            return node.value
+
+        bucket.insert(key, delta, hash_value)
+        self._size += 1
+
+        if bucket.length() > TREEIFY_THRESHOLD and isinstance(bucket, LinkedList):
+            self._treeify(buckets, index)
+
+        return delta
+
     def empty_buckets(self) -> int:
         """
         A method that counts the number of empty buckets in the hash table by iterating
         over the buckets and keeping a count of the ones that have linked lists with
-        lengths equal to 0.
+        lengths equal to 0.  A resize in progress is finished first.
         :return: integer
         """
 
+        self._finish_migration()
+
         # set bucket counter
         buckets = 0
 
@@ -147,66 +302,306 @@ class HashMap:
 
     def clear(self) -> None:
         """
-        A method that reinitialized the hash map using its current capacity and hash function.
-        This method results in a cleared hash table of the same size.
+        A method that empties the hash table keeping its capacity, hash function and options.
+        The linked lists of the buckets are emptied in place instead of being allocated
+        again, and a resize in progress is dropped with the old buckets, creating the new
+        buckets it had not created yet.  The statistics start over.
         :return: None
         """
 
-        self.__init__(self._capacity, self._hash_function)
+        buckets = self._buckets.unchecked()
+
+        for i in range(self._capacity):
+            bucket = buckets[i]
+
+            if bucket is None or isinstance(bucket, TreeBucket):
+                buckets[i] = LinkedList()
+            elif bucket.length():
+                bucket.detach()
+
+        self._old_buckets = None
+        self._migrate_index = 0
+        self._fill_index = 0
+        self._size = 0
+        self._rebuilds += 1
+
+        if self._stats is not None:
+            self._stats = HashMapStats()
+
+    def _adjusted_capacity(self, new_capacity: int) -> int:
+        """
+        A method that takes as a parameter a requested capacity and returns the capacity
+        allowed by the capacity policy the table is resized to, doubling it until the
+        table load is <= 1.0.
+        :param new_capacity: integer
+        :return: integer
+        """
+
+        # capacity must be allowed by the capacity policy, and a prime capacity is kept
+        if self._capacity_policy != 'prime' or not is_prime(new_capacity):
+            new_capacity = self._next_capacity(new_capacity)
+
+        # recalculate table load
+        table_load = self._size / new_capacity
+
+        # adjust capacity until table load is <= 1.0
+        while table_load > 1.0:
+
+            new_capacity = self._next_capacity(new_capacity * 2)
+
+            table_load = self._size / new_capacity
+
+        return new_capacity
 
     def resize_table(self, new_capacity: int) -> None:
         """
         A method that takes as a parameter an integer representing a new capacity
         and resizes the hash table based on this new capacity.  It starts by
         validating that the new capacity is greater than or equal to the current
-        hash table size.  Then it saves an array of the key value pairs, clears
-        the table, recalculates the table load and adjusts the capacity as necessary,
-        checks if the new capacity is prime and adjusts if necessary, adjusts number of
-        buckets based on capacity, and finally rehashes all the saved key value
-        pairs into the new hash table.
+        hash table size.  Then it recalculates the table load and adjusts the capacity
+        as necessary, checks if the new capacity is prime and adjusts if necessary,
+        resizes the bucket array in place and finally relinks every node into its new
+        bucket using the hash cached in the node, so the hash function is not called
+        again and no node is allocated.  An incremental resize in progress is finished first.
         :param new_capacity: integer
         :return: None
         """
 
-        if new_capacity >= 1:
+        # array buckets are resized by _array_resize
+        if new_capacity >= 1 and self._array_buckets:
+            self._array_resize(new_capacity)
 
-            # preserve key value elements
-            cur_buckets = self.get_keys_and_values()
+        elif new_capacity >= 1:
 
-            # capacity must be a prime number
-            if not self._is_prime(new_capacity):
-                new_capacity = self._next_prime(new_capacity)
+            self._finish_migration()
+            start = perf_counter()
 
-            # recalculate table load
-            table_load = self._size / new_capacity
-
-            # adjust capacity until table load is <= 1.0
-            while table_load > 1.0:
+            # take the chains out of the buckets
+            buckets = self._buckets
+            old_capacity = buckets.length()
+            lists = buckets.unchecked()
+            chains = []
 
-                new_capacity = new_capacity * 2
+            for i in range(old_capacity):
+                bucket = lists[i]
 
-                if not self._is_prime(new_capacity):
-                    new_capacity = self._next_prime(new_capacity)
+                if bucket.length():
+                    chains.append(bucket.detach())
 
-                table_load = self._size / new_capacity
+                    # treeified buckets start over as linked lists
+                    if isinstance(bucket, TreeBucket):
+                        lists[i] = LinkedList()
 
             # assign new capacity to attribute
-            self._capacity = new_capacity
+            self._capacity = self._adjusted_capacity(new_capacity)
+            capacity = self._capacity
 
-            # create an empty hash table
-            new_buckets = DynamicArray()
+            # reuse the bucket array, with empty linked lists for the buckets it gains
+            buckets.resize(capacity)
 
-            for i in range(self._capacity):
-                new_buckets.append(LinkedList())
+            for i in range(old_capacity, capacity):
+                lists[i] = LinkedList()
+
+            self._rebuilds += 1
+
+            # relink nodes into the hash table using their cached hash
+            for node in chains:
+                while node:
+                    next_node = node.next
+                    index = node.hash % capacity
+                    bucket = lists[index]
+                    bucket.insert_node(node)
+
+                    if bucket.length() > TREEIFY_THRESHOLD and isinstance(bucket, LinkedList):
+                        self._treeify(lists, index)
+
+                    node = next_node
+
+            if self._stats is not None:
+                self._stats.record_resize(perf_counter() - start)
+
+    def _array_resize(self, new_capacity: int) -> None:
+        """
+        A method that takes as a parameter an integer representing a new capacity and
+        resizes a hash table of array buckets: the filled buckets are taken out of the
+        bucket array and replaced by empty ones, the array is resized in place and every
+        pair is added back to its new bucket using its cached hash.
+        :param new_capacity: integer
+        :return: None
+        """
+
+        start = perf_counter()
+        buckets = self._buckets
+        old_capacity = buckets.length()
+        lists = buckets.unchecked()
+        chains = []
+
+        # the filled buckets hold the pairs to add back, so they are not copied
+        for i in range(old_capacity):
+            if lists[i]:
+                chains.append(lists[i])
+                lists[i] = ArrayBucket()
+
+        # assign new capacity to attribute
+        self._capacity = self._adjusted_capacity(new_capacity)
+        capacity = self._capacity
+
+        # reuse the bucket array, with empty array buckets for the buckets it gains
+        buckets.resize(capacity)
+
+        for i in range(old_capacity, capacity):
+            lists[i] = ArrayBucket()
+
+        self._rebuilds += 1
+
+        # add the hash, key, value triples back using their cached hash
+        for items in chains:
+            for i in range(0, len(items), 3):
+                lists[items[i] % capacity].insert(items[i + 1], items[i + 2], items[i])
+
+        if self._stats is not None:
+            self._stats.record_resize(perf_counter() - start)
 
-            # assign new hash table to attribute
-            self._buckets = new_buckets
-            self._size = 0
+    def _treeify(self, buckets: list, index: int) -> None:
+        """
+        A method that takes as parameters the list of buckets and the index of a linked
+        list that has grown longer than TREEIFY_THRESHOLD, and replaces the linked list
+        with a TreeBucket holding the same nodes, so lookups in it take O(log n).
+        :param buckets: list
+        :param index: integer
+        :return: None
+        """
+
+        buckets[index] = TreeBucket(buckets[index].detach())
+
+    def _untreeify(self, buckets: list, index: int) -> None:
+        """
+        A method that takes as parameters the list of buckets and the index of a TreeBucket
+        that has shrunk below UNTREEIFY_THRESHOLD, and replaces it with a linked list
+        holding the same nodes.
+        :param buckets: list
+        :param index: integer
+        :return: None
+        """
+
+        chain = LinkedList()
+        node = buckets[index].detach()
+
+        while node:
+            next_node = node.next
+            chain.insert_node(node)
+            node = next_node
+
+        buckets[index] = chain
+
+    def _start_migration(self, new_capacity: int) -> None:
+        """
+        A method that takes as a parameter an integer representing a new capacity and
+        starts an incremental resize.  The current buckets become the old buckets and
+        the new buckets start out as None, to be replaced by linked lists as the
+        migration advances, so starting the resize costs no per-bucket work.
+        :param new_capacity: integer
+        :return: None
+        """
+
+        # only one resize can be in progress
+        self._finish_migration()
+        start = perf_counter()
+
+        self._old_buckets = self._buckets
+        self._capacity = self._adjusted_capacity(new_capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._migrate_index = 0
+        self._fill_index = 0
+        self._rebuilds += 1
+
+        if self._stats is not None:
+            self._stats.record_resize(perf_counter() - start)
+
+    def _migrate(self, count: int) -> None:
+        """
+        A method that takes as a parameter a number of old buckets and moves the nodes
+        of that many old buckets into the new buckets.  The new buckets are filled with
+        empty linked lists at the same pace, so all of them exist when the last old
+        bucket has been moved and the old buckets are dropped.
+        :param count: integer
+        :return: None
+        """
+
+        start = perf_counter()
+        old_capacity = self._old_buckets.length()
+        old_buckets = self._old_buckets.unchecked()
+        new_buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        end = min(self._migrate_index + count, old_capacity)
+
+        # relink nodes of the next old buckets using their cached hash
+        for i in range(self._migrate_index, end):
+            node = old_buckets[i].detach()
+
+            while node:
+                next_node = node.next
+                index = node.hash % capacity
+
+                if new_buckets[index] is None:
+                    new_buckets[index] = LinkedList()
+
+                bucket = new_buckets[index]
+                bucket.insert_node(node)
+
+                if bucket.length() > TREEIFY_THRESHOLD and isinstance(bucket, LinkedList):
+                    self._treeify(new_buckets, index)
+
+                node = next_node
+
+            old_buckets[i] = None
+
+        self._migrate_index = end
+
+        # create the new buckets that are still missing in proportion to the old buckets moved
+        fill_end = -(-capacity * end // old_capacity)
+
+        for i in range(self._fill_index, fill_end):
+            if new_buckets[i] is None:
+                new_buckets[i] = LinkedList()
+
+        self._fill_index = fill_end
 
-            # rehash values into new hash table
-            for i in range(cur_buckets.length()):
-                key, value = cur_buckets[i]
-                self.put(key, value)
+        if end == old_capacity:
+            self._old_buckets = None
+
+        if self._stats is not None:
+            self._stats.record_migration(perf_counter() - start)
+
+    def _finish_migration(self) -> None:
+        """
+        A method that moves all the remaining old buckets if an incremental resize
+        is in progress.
+        :return: None
+        """
+
+        if self._old_buckets is not None:
+            self._migrate(self._old_buckets.length())
+
+    def _old_contains(self, key: str, hash_value: int):
+        """
+        A method that takes as parameters a key and its hash value and returns the node
+        with that key if a resize is in progress and the key has not yet been moved out
+        of the old buckets, or None.
+        :param key: string
+        :param hash_value: integer
+        :return: SLNode
+        """
+
+        old_buckets = self._old_buckets
+
+        if old_buckets is None:
+            return
+
+        bucket = old_buckets.unchecked()[hash_value % old_buckets.length()]
+
+        if bucket is not None:
+            return bucket.contains(key, hash_value)
 
     def get(self, key: str):
         """
@@ -221,9 +616,12 @@ class HashMap:
         if self.get_size() > 0:
 
             # calculate index and get node value if it exists
-            hash_value = self._hash_function(key)
-            index = hash_value % self._capacity
-            node = self._buckets[index].contains(key)
+            hash_value = self._hash_function(key) if self._stats is None else self._record('get', key)
+
+            if self._array_buckets:
+                return self._buckets.unchecked()[hash_value % self._capacity].get(key, hash_value)
+
+            node = self._find(key, hash_value)
 
             # if node exists return the value
             if node:
@@ -241,16 +639,39 @@ class HashMap:
         # checks if hash table is empty
         if self.get_size() > 0:
 
-            # calculate index
-            hash_value = self._hash_function(key)
-            index = hash_value % self._capacity
+            # checks for presence of node with matching hash and key
+            hash_value = self._hash_function(key) if self._stats is None else self._record('contains_key', key)
 
-            # checks for presence of node and matching key value
-            if self._buckets[index].contains(key) and self._buckets[index].contains(key).key == key:
+            if self._array_buckets:
+                return self._buckets.unchecked()[hash_value % self._capacity].find(key, hash_value) >= 0
+
+            if self._find(key, hash_value):
                 return True
 
         return False
 
+    def _find(self, key: str, hash_value: int):
+        """
+        A method that takes as parameters a key and its hash value and returns the node
+        with that key, or None.  While a resize is in progress it advances the resize
+        and looks in both the new and the old buckets.
+        :param key: string
+        :param hash_value: integer
+        :return: SLNode
+        """
+
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_resize)
+            node = self._old_contains(key, hash_value)
+
+            if node:
+                return node
+
+        bucket = self._buckets.unchecked()[hash_value % self._capacity]
+
+        if bucket is not None:
+            return bucket.contains(key, hash_value)
+
     def remove(self, key: str) -> None:
         """
         A method that takes as a parameter a key and, if the hash table is not empty,
@@ -262,17 +683,254 @@ class HashMap:
         """
 
         # calculate index
-        hash = self._hash_function(key)
+        hash = self._hash_function(key) if self._stats is None else self._record('remove', key)
         index = hash % self._capacity
 
+        # while a resize is in progress the key may still be in the old buckets
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_resize)
+
+            if self._old_buckets is not None:
+                old_bucket = self._old_buckets.unchecked()[hash % self._old_buckets.length()]
+
+                if old_bucket is not None and old_bucket.remove(key, hash):
+                    self._size -= 1
+                    return
+
         # if key value was removed decrement size
-        if self._buckets[index].remove(key):
+        buckets = self._buckets.unchecked()
+        bucket = buckets[index]
+
+        if bucket is not None and bucket.remove(key, hash):
             self._size -= 1
 
+            # a treeified bucket that shrinks enough goes back to a linked list
+            if isinstance(bucket, TreeBucket) and bucket.length() < UNTREEIFY_THRESHOLD:
+                self._untreeify(buckets, index)
+
+    def put_many(self, pairs) -> None:
+        """
+        A method that takes as a parameter an iterable of key-value pairs and inserts them
+        into the hash table.  The table is resized at most once, before any pair is inserted,
+        to a capacity that keeps the table load <= 1.0 for all of them, and the pairs are then
+        inserted in a loop that skips the per-put load check.
+        :param pairs: iterable of (key, value) tuples
+        :return: None
+        """
+
+        if not isinstance(pairs, (list, tuple)):
+            pairs = list(pairs)
+
+        # size the table once for all the pairs, which also finishes a resize in progress
+        if (self._size + len(pairs)) / self._capacity > 1.0:
+            self.resize_table(self._size + len(pairs))
+        else:
+            self._finish_migration()
+
+        hashes = self._hash_keys([pair[0] for pair in pairs])
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        stats = self._stats
+
+        if self._array_buckets:
+            for (key, value), hash_value in zip(pairs, hashes):
+                if stats is not None:
+                    stats.record('put', self._probe_length(key, hash_value))
+
+                if buckets[hash_value % capacity].put(key, value, hash_value):
+                    self._size += 1
+            return
+
+        for (key, value), hash_value in zip(pairs, hashes):
+            if stats is not None:
+                stats.record('put', self._probe_length(key, hash_value))
+
+            index = hash_value % capacity
+            bucket = buckets[index]
+            node = bucket.contains(key, hash_value)
+
+            if node:
+                node.value = value
+            else:
+                bucket.insert(key, value, hash_value)
+                self._size += 1
+
+                if bucket.length() > TREEIFY_THRESHOLD and isinstance(bucket, LinkedList):
+                    self._treeify(buckets, index)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        A method that takes as a parameter an iterable of keys and returns a DynamicArray
+        with the value of each key, or None for keys that are not in the hash table,
+        in the same order as the keys.
+        :param keys: iterable of strings
+        :return: DynamicArray
+        """
+
+        if not isinstance(keys, (list, tuple)):
+            keys = list(keys)
+
+        hashes = self._hash_keys(keys)
+        stats = self._stats
+        values = []
+
+        for key, hash_value in zip(keys, hashes):
+            if stats is not None:
+                stats.record('get', self._probe_length(key, hash_value))
+
+            if self._array_buckets:
+                values.append(self._buckets.unchecked()[hash_value % self._capacity].get(key, hash_value))
+                continue
+
+            node = self._find(key, hash_value)
+            values.append(node.value if node else None)
+
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> None:
+        """
+        A method that takes as a parameter an iterable of keys and removes each of them
+        from the hash table.  Keys that are not in the hash table are ignored.
+        :param keys: iterable of strings
+        :return: None
+        """
+
+        if not isinstance(keys, (list, tuple)):
+            keys = list(keys)
+
+        self._finish_migration()
+
+        hashes = self._hash_keys(keys)
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        stats = self._stats
+
+        for key, hash_value in zip(keys, hashes):
+            if stats is not None:
+                stats.record('remove', self._probe_length(key, hash_value))
+
+            index = hash_value % capacity
+            bucket = buckets[index]
+
+            if bucket.remove(key, hash_value):
+                self._size -= 1
+
+                if isinstance(bucket, TreeBucket) and bucket.length() < UNTREEIFY_THRESHOLD:
+                    self._untreeify(buckets, index)
+
+    def _hash_keys(self, keys: list) -> list:
+        """
+        A method that takes as a parameter a list of keys and returns their hashes,
+        timing the hash function when statistics are enabled.
+        :param keys: list of strings
+        :return: list of integers
+        """
+
+        if self._stats is None:
+            return hash_keys(self._hash_function, keys)
+
+        return self._stats.hash_many(self._hash_function, keys)
+
+    def _record(self, operation: str, key: str) -> int:
+        """
+        A method that takes as parameters the name of an operation and a key, records the
+        time spent hashing the key and the number of probes of the operation, and returns
+        the hash value of the key.  Only called when statistics are enabled.
+        :param operation: string
+        :param key: string
+        :return: integer
+        """
+
+        hash_value = self._stats.hash(self._hash_function, key)
+        self._stats.record(operation, self._probe_length(key, hash_value))
+
+        return hash_value
+
+    def _probe_length(self, key: str, hash_value: int) -> int:
+        """
+        A method that takes as parameters a key and its hash value and returns the number
+        of nodes compared with the key to find it, or to find that it is missing, in the
+        old buckets of a resize in progress and in the new buckets.
+        :param key: string
+        :param hash_value: integer
+        :return: integer
+        """
+
+        probes = 0
+
+        for buckets in (self._old_buckets, self._buckets):
+            if buckets is None:
+                continue
+
+            bucket = buckets[hash_value % buckets.length()]
+
+            if bucket is None:
+                continue
+
+            # a treeified bucket is binary searched
+            if isinstance(bucket, TreeBucket):
+                probes += bucket.length().bit_length()
+
+                if bucket.contains(key, hash_value):
+                    return probes
+
+                continue
+
+            # an array bucket is scanned from its first pair, as find() does
+            if self._array_buckets:
+                index = bucket.find(key, hash_value)
+
+                if index >= 0:
+                    return probes + index // 3 + 1
+
+                probes += bucket.length()
+                continue
+
+            for node in bucket:
+                probes += 1
+
+                if node.hash == hash_value and node.key == key:
+                    return probes
+
+        return probes
+
+    def get_stats(self) -> dict:
+        """
+        A method that returns a dictionary describing the hash table: its size, capacity,
+        load and a histogram of the chain lengths, mapping each length to the number of
+        buckets with a chain of that length.  With statistics enabled it also holds the
+        probe counts of every operation, the number and time of the hash function calls
+        and the number and time of the resizes (see HashMapStats.snapshot).
+        :return: dictionary
+        """
+
+        stats = self._stats.snapshot() if self._stats is not None else {}
+        chain_lengths = {}
+
+        for buckets in (self._old_buckets, self._buckets):
+            if buckets is None:
+                continue
+
+            for i in range(buckets.length()):
+                length = buckets[i].length() if buckets[i] is not None else 0
+                chain_lengths[length] = chain_lengths.get(length, 0) + 1
+
+        stats.update({
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'chain_lengths': dict(sorted(chain_lengths.items())),
+            'longest_chain': max(chain_lengths),
+        })
+
+        return stats
+
     def get_keys_and_values(self) -> DynamicArray:
         """
         A method that iterates through the hash table and copies buckets containing
         key value pairs into a new DynamicArray that is returned by the method.
+        While a resize is in progress the old buckets that have not been moved are
+        copied as well.
         :return: DynamicArray
         """
 
@@ -280,65 +938,276 @@ class HashMap:
         keys_values_arr = DynamicArray()
 
         # iterate through buckets and if a bucket contains values copy them to the new array
-        for i in range(self.get_capacity()):
-            if self._buckets[i].length() > 0:
-                for j in self._buckets[i]:
-                    keys_values_arr.append((j.key, j.value))
+        for buckets in (self._old_buckets, self._buckets):
+            if buckets is None:
+                continue
+
+            for i in range(buckets.length()):
+                if buckets[i] is not None and buckets[i].length() > 0:
+
+                    # array buckets hold (hash, key, value) triples instead of nodes
+                    if self._array_buckets:
+                        for _, key, value in buckets[i]:
+                            keys_values_arr.append((key, value))
+                        continue
+
+                    for j in buckets[i]:
+                        keys_values_arr.append((j.key, j.value))
 
         return keys_values_arr
 
+    def __iter__(self):
+        """
+        A method that returns a generator over the nodes of the hash table, so callers
+        can read node.key and node.value without a tuple being built for every pair.
+        Array buckets hold no nodes, so an SLNode copy of every pair is built for them;
+        the views and the other methods of the map read the pairs with _pairs() instead.
+        Every call returns an independent generator, so loops over the same map can be
+        nested.  An incremental resize in progress is finished first, and a generator
+        raises RuntimeError if the table is resized while it is in use.
+        :return: generator
+        """
+
+        if self._array_buckets:
+            return (SLNode(key, value, None, hash_value)
+                    for hash_value, key, value in self._walk())
+
+        return self._walk()
+
+    def _walk(self):
+        """
+        A method that returns a generator over the items of the buckets of the hash table,
+        nodes or the (hash, key, value) triples of array buckets, for __iter__ and _pairs.
+        :return: generator
+        """
+
+        self._finish_migration()
+        rebuilds = self._rebuilds
+
+        for bucket in self._buckets.unchecked():
+            for node in bucket:
+
+                # the buckets are rebuilt by a resize or clear
+                if self._rebuilds != rebuilds:
+                    raise RuntimeError("HashMap resized during iteration")
+
+                yield node
+
+        # a rebuild may have emptied the buckets that were left
+        if self._rebuilds != rebuilds:
+            raise RuntimeError("HashMap resized during iteration")
+
+    def _pairs(self):
+        """
+        A method that returns a generator over the (key, value) tuples of the hash table,
+        with the same checks as __iter__, read in place from array buckets so no node is
+        built for their pairs.
+        :return: generator
+        """
 
-def find_mode(da: DynamicArray) -> (DynamicArray, int):
+        if self._array_buckets:
+            return ((key, value) for _, key, value in self._walk())
+
+        return ((node.key, node.value) for node in self._walk())
+
+    def keys(self) -> KeysView:
+        """
+        A method that returns a view of the keys of the hash table, read lazily.
+        :return: KeysView
+        """
+
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        """
+        A method that returns a view of the values of the hash table, read lazily.
+        :return: ValuesView
+        """
+
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        """
+        A method that returns a view of the (key, value) tuples of the hash table, read lazily.
+        :return: ItemsView
+        """
+
+        return ItemsView(self)
+
+    def dump(self, path: str, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        A method that takes as a parameter a path and writes a binary snapshot of the
+        hash table to it: the capacity, the options of the map, and for every node its
+        bucket index, cached hash, key and value, written chunk_size nodes at a time.
+        The nodes of every bucket are written from the tail of the chain, so load()
+        rebuilds each chain in the same order.  An incremental resize in progress is
+        finished first.
+        :param path: string
+        :param chunk_size: integer
+        :return: None
+        """
+
+        self._finish_migration()
+
+        options = {'incremental_resize': self._incremental_resize, 'seed': self._seed,
+                   'stats': self._stats is not None, 'capacity_policy': self._capacity_policy,
+                   'buckets': self._bucket_type}
+
+        def records():
+            for i in range(self._capacity):
+                bucket = self._buckets[i]
+
+                # load() appends to array buckets, so their pairs are written in list order
+                if self._array_buckets:
+                    for j in range(0, len(bucket), 3):
+                        yield i, bucket[j], bucket[j + 1], bucket[j + 2]
+                    continue
+
+                for node in reversed(list(bucket)):
+                    yield i, node.hash, node.key, node.value
+
+        write_snapshot(path, b'sc', self._capacity, self._size, self._function, options,
+                       records(), chunk_size)
+
+    @classmethod
+    def load(cls, path: str, function: callable = hash_function_1) -> "HashMap":
+        """
+        A method that takes as parameters the path of a snapshot written by dump() and
+        the hash function the map was created with, and returns a new map with the same
+        capacity and options.  Every node goes back to the bucket it was dumped from with
+        its cached hash, so no key is hashed and the table is not resized.
+        With a process-randomized hash function such as builtin_hash the keys are hashed
+        again instead, as their cached hashes are only valid in the process that dumped them.
+        :param path: string
+        :param function: hash function
+        :return: HashMap
+        """
+
+        capacity, size, options, records = read_snapshot(path, b'sc', function)
+        map = cls(capacity, function, **options)
+
+        # the constructor rounds the capacity through the capacity policy, but the nodes
+        # were placed for the dumped capacity, e.g. 2 after resize_table(2)
+        if map._capacity != capacity:
+            bucket_class = ArrayBucket if map._array_buckets else LinkedList
+            map._buckets = DynamicArray([bucket_class() for _ in range(capacity)])
+            map._capacity = capacity
+
+        # the cached hashes of a process-randomized hash function are only valid in the
+        # process that dumped them, so every key is hashed again
+        if is_process_randomized(function):
+            for _, _, key, value in records:
+                map.put(key, value)
+
+            # the puts of the load are not counted
+            if map._stats is not None:
+                map._stats = HashMapStats()
+
+            return map
+
+        buckets = map._buckets
+
+        for index, hash_value, key, value in records:
+            bucket = buckets[index]
+            bucket.insert(key, value, hash_value)
+
+            if bucket.length() > TREEIFY_THRESHOLD and isinstance(bucket, LinkedList):
+                map._treeify(buckets.unchecked(), index)
+
+        map._size = size
+        return map
+
+    def freeze(self) -> FrozenHashMap:
+        """
+        A method that returns an immutable FrozenHashMap with the key value pairs of the
+        hash table, whose get and contains_key compare a single key whatever the keys are,
+        and which stores the pairs in two packed arrays instead of one node per pair.
+        :return: FrozenHashMap
+        """
+
+        return FrozenHashMap(self._pairs())
+
+
+def _count_chunk(values: list) -> list:
+    """
+    A function that takes as a parameter a list of values and returns a list of
+    (value, frequency) tuples for the distinct values, in the order in which each
+    value first occurs.  Used by the worker processes of find_mode.
+    :param values: list
+    :return: list of tuples
+    """
+
+    map = HashMap()
+    first_seen = []
+
+    for key in values:
+        if map.increment(key) == 1:
+            first_seen.append(key)
+
+    return [(key, map.get(key)) for key in first_seen]
+
+
+def find_mode(da: DynamicArray, processes: int = None,
+              chunk_size: int = 100000) -> (DynamicArray, int):
     """
     A function that takes as a parameter a DynamicArray and returns a tuple
     containing a DynamicArray containing the value(s) that are the mode of
     the parameter array and an integer representing the frequency of the mode.
     O(n) runtime complexity.
+    With processes greater than 1 the array is split into chunks of chunk_size
+    values that are counted in parallel by a pool of that many worker processes,
+    and the partial counts are merged in the order of the chunks.  Keys reach the
+    merged map in the order they first occur in the array, as they do when the
+    array is counted serially, so both ways return the same result.
     :param da: DynamicArray
+    :param processes: integer
+    :param chunk_size: integer
     :return: tuple (DynamicArray, int)
     """
 
     # create new HashMap()
     map = HashMap()
+    length = da.length()
 
-    # loop through the parameter array and add values to the hash map
     # the values in the parameter array are keys in the hash map
     # and the value associated with each key in the hash map is the
     # frequency of the key in the parameter array
-    for i in range(da.length()):
+    if processes is None or processes <= 1 or length <= chunk_size:
+        for i in range(length):
+            map.increment(da[i])
 
-        key = da[i]
-        cur_value = map.get(key)
+    else:
+        from multiprocessing import Pool
 
-        # if key already exists put key with incremented value
-        if cur_value:
-            map.put(key, cur_value + 1)
+        chunks = ([da[i] for i in range(start, min(start + chunk_size, length))]
+                  for start in range(0, length, chunk_size))
 
-        # add key with value of 1 if it does not exist in the HashMap
-        else:
-            map.put(key, 1)
+        # merge the partial counts as the chunks are finished, in order
+        with Pool(processes) as pool:
+            for counts in pool.imap(_count_chunk, chunks):
+                for key, frequency in counts:
+                    map.increment(key, frequency)
 
-    # extract key value pairs from HashMap and initialize new variable and DynamicArray
-    key_value_list = map.get_keys_and_values()
+    # initialize new variable and DynamicArray
     max_frequency = None
     mode_arr = DynamicArray()
 
-    # iterate through list of key value pairs while looking for
-    # key value pairs that have the highest value
-    for i in range(key_value_list.length()):
+    # iterate through the pairs of the HashMap while looking for
+    # keys that have the highest value
+    for key, value in map._pairs():
 
         if max_frequency is None:
-            max_frequency = key_value_list[i][1]
+            max_frequency = value
 
         # elements with equal frequency are recorded
-        if key_value_list[i][1] == max_frequency:
-            mode_arr.append(key_value_list[i][0])
+        if value == max_frequency:
+            mode_arr.append(key)
 
         # overwrite array if elements with higher frequency are found
-        if key_value_list[i][1] > max_frequency:
-            max_frequency = key_value_list[i][1]
+        if value > max_frequency:
+            max_frequency = value
             mode_arr = DynamicArray()
-            mode_arr.append(key_value_list[i][0])
+            mode_arr.append(key)
 
     return mode_arr, max_frequency
 
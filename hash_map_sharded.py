@@ -0,0 +1,379 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Hash Map partitioned across worker processes, each owning one
+#              shard of the keys in a separate chaining or open addressing HashMap
+
+import multiprocessing
+import zlib
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+import hash_map_oa
+import hash_map_sc
+
+# HashMap classes a shard can use, by name
+SHARD_MAPS = {
+    'sc': hash_map_sc.HashMap,
+    'oa': hash_map_oa.HashMap,
+}
+
+
+def shard_of(key: str, shards: int) -> int:
+    """
+    Return the shard that owns a key.  CRC-32 is used rather than the hash
+    function of the shards so keys spread evenly over the shards whatever
+    that function is, and the same key always goes to the same shard.
+    """
+    return zlib.crc32(key.encode('utf-8', 'surrogatepass')) % shards
+
+
+def _serve(connection, map_name: str, capacity: int, function) -> None:
+    """
+    Loop of a worker process: receive (method, arguments) requests, call the
+    method on the shard and send back ('ok', result) or ('error', exception),
+    until a None request or the connection is closed.
+    """
+    map = SHARD_MAPS[map_name](capacity, function)
+
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+
+        if request is None:
+            break
+
+        method, arguments = request
+        try:
+            result = getattr(map, method)(*arguments)
+
+            # DynamicArray results are sent as lists
+            if isinstance(result, DynamicArray):
+                result = [result[i] for i in range(result.length())]
+
+            connection.send(('ok', result))
+        except Exception as error:
+            connection.send(('error', error))
+
+    connection.close()
+
+
+class ShardedHashMap:
+    """
+    HashMap split into shards that live in separate worker processes.
+    Every key belongs to one shard, chosen by shard_of().  Single-key calls
+    go to the shard of the key; the batch calls split the batch by shard,
+    send every shard its part before waiting for any answer, so the shards
+    work in parallel, and return the results in the order of the input.
+    The map must be closed, or used as a context manager, to stop the workers.
+    """
+
+    def __init__(self, shards: int = 4, map: str = 'oa', capacity: int = 11,
+                 function: callable = hash_function_1) -> None:
+        """
+        Initialize new ShardedHashMap with the given number of worker processes,
+        each holding a HashMap of the given kind ('sc' or 'oa') with the given
+        initial capacity and hash function.  The hash function is sent to the
+        workers, so it must be a module-level function.
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+
+        if map not in SHARD_MAPS:
+            raise ValueError(f"unknown map: {map}")
+
+        self._connections = []
+        self._workers = []
+
+        for _ in range(shards):
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_serve, daemon=True,
+                                             args=(worker_connection, map, capacity, function))
+            worker.start()
+            worker_connection.close()
+
+            self._connections.append(connection)
+            self._workers.append(worker)
+
+    def __enter__(self) -> "ShardedHashMap":
+        """Return the map when used as a context manager"""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop the workers when leaving the context"""
+        self.close()
+
+    def close(self) -> None:
+        """
+        A method that stops the worker processes.  The map cannot be used afterwards.
+        :return: None
+        """
+
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+
+        for worker in self._workers:
+            worker.join()
+
+        self._connections = []
+        self._workers = []
+
+    def get_shards(self) -> int:
+        """
+        Return the number of shards of the map
+        """
+        return len(self._connections)
+
+    # ------------------------------------------------------------------ #
+
+    def _receive(self, shard: int):
+        """
+        A method that takes as a parameter a shard and returns the answer to the request
+        sent to it, raising the exception of the worker if the request failed.
+        :param shard: integer
+        :return: object
+        """
+
+        status, result = self._connections[shard].recv()
+
+        if status == 'error':
+            raise result
+
+        return result
+
+    def _call(self, shard: int, method: str, *arguments):
+        """
+        A method that calls a method of the HashMap of one shard and returns its result.
+        :param shard: integer
+        :param method: string
+        :return: object
+        """
+
+        self._connections[shard].send((method, arguments))
+        return self._receive(shard)
+
+    def _call_all(self, method: str, arguments: list) -> list:
+        """
+        A method that takes as parameters the name of a method and a list with the
+        arguments for every shard, or None for shards to skip.  It sends every request
+        before receiving any answer, so the shards run in parallel, and returns the
+        list of the results, None for the skipped shards.  If requests fail, the
+        exception of the first failed shard is raised once every answer is received.
+        :param method: string
+        :param arguments: list of tuples
+        :return: list
+        """
+
+        for shard, shard_arguments in enumerate(arguments):
+            if shard_arguments is not None:
+                self._connections[shard].send((method, shard_arguments))
+
+        # every answer is read, even after an error, so none is left in a pipe to be
+        # taken for the answer of a later request
+        results, error = [], None
+        for shard, shard_arguments in enumerate(arguments):
+            if shard_arguments is None:
+                results.append(None)
+                continue
+
+            status, result = self._connections[shard].recv()
+            if status == 'error':
+                if error is None:
+                    error = result
+                result = None
+            results.append(result)
+
+        if error is not None:
+            raise error
+
+        return results
+
+    def _split(self, keys: list) -> list:
+        """
+        A method that takes as a parameter a list of keys and returns, for every shard,
+        the list of the positions in the input of the keys the shard owns.
+        :param keys: list of strings
+        :return: list of lists of integers
+        """
+
+        shards = len(self._connections)
+        positions = [[] for _ in range(shards)]
+
+        for i, key in enumerate(keys):
+            positions[shard_of(key, shards)].append(i)
+
+        return positions
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        A method that takes as parameters a key-value pair and puts it in the shard of the key.
+        :param key: string
+        :param value: object
+        :return: None
+        """
+
+        self._call(shard_of(key, len(self._connections)), 'put', key, value)
+
+    def get(self, key: str) -> object:
+        """
+        A method that takes as a parameter a key and returns its value, or None.
+        :param key: string
+        :return: object
+        """
+
+        return self._call(shard_of(key, len(self._connections)), 'get', key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        A method that takes as a parameter a key and returns True if it is in the map.
+        :param key: string
+        :return: boolean
+        """
+
+        return self._call(shard_of(key, len(self._connections)), 'contains_key', key)
+
+    def remove(self, key: str) -> None:
+        """
+        A method that takes as a parameter a key and removes it from the map if it is found.
+        :param key: string
+        :return: None
+        """
+
+        self._call(shard_of(key, len(self._connections)), 'remove', key)
+
+    def put_many(self, pairs) -> None:
+        """
+        A method that takes as a parameter an iterable of key-value pairs and puts them
+        in their shards with one put_many request per shard, run in parallel.
+        :param pairs: iterable of (key, value) tuples
+        :return: None
+        """
+
+        pairs = list(pairs)
+        positions = self._split([pair[0] for pair in pairs])
+
+        self._call_all('put_many', [([pairs[i] for i in shard_positions],) if shard_positions else None
+                                    for shard_positions in positions])
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        A method that takes as a parameter an iterable of keys and returns a DynamicArray
+        with the value of each key, or None for missing keys, in the order of the keys.
+        Every shard looks up its keys with one get_many request, run in parallel.
+        :param keys: iterable of strings
+        :return: DynamicArray
+        """
+
+        keys = list(keys)
+        positions = self._split(keys)
+
+        results = self._call_all('get_many', [([keys[i] for i in shard_positions],) if shard_positions else None
+                                              for shard_positions in positions])
+
+        # put every value back at the position of its key
+        values = [None] * len(keys)
+        for shard_positions, shard_values in zip(positions, results):
+            if shard_values is not None:
+                for i, value in zip(shard_positions, shard_values):
+                    values[i] = value
+
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> None:
+        """
+        A method that takes as a parameter an iterable of keys and removes them from their
+        shards with one remove_many request per shard, run in parallel.
+        :param keys: iterable of strings
+        :return: None
+        """
+
+        keys = list(keys)
+        positions = self._split(keys)
+
+        self._call_all('remove_many', [([keys[i] for i in shard_positions],) if shard_positions else None
+                                       for shard_positions in positions])
+
+    def get_size(self) -> int:
+        """
+        Return size of map, the total size of the shards
+        """
+        return sum(self._call_all('get_size', [()] * len(self._connections)))
+
+    def clear(self) -> None:
+        """
+        A method that clears every shard.
+        :return: None
+        """
+
+        self._call_all('clear', [()] * len(self._connections))
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        A method that returns a DynamicArray of tuples with the key value pairs
+        of all the shards, shard by shard.
+        :return: DynamicArray
+        """
+
+        keys_values_arr = DynamicArray()
+
+        for shard_pairs in self._call_all('get_keys_and_values', [()] * len(self._connections)):
+            for pair in shard_pairs:
+                keys_values_arr.append(pair)
+
+        return keys_values_arr
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from hash_functions import fnv1a_hash
+
+    print("\nShardedHashMap - put and get example 1")
+    print("--------------------------------------")
+    with ShardedHashMap(3, 'sc', 53, hash_function_2) as m:
+        for i in range(150):
+            m.put('str' + str(i), i * 100)
+        m.remove('str0')
+        print(m.get_size(), m.get('str1'), m.get('str0'), m.contains_key('str149'))
+        print(m.get_many(['str2', 'missing', 'str3']))
+
+    print("\nShardedHashMap - throughput of put_many and get_many")
+    print("----------------------------------------------------")
+    rnd = random.Random(1)
+    pairs = [(''.join(rnd.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(20)), i)
+             for i in range(100000)]
+    keys = [key for key, _ in pairs]
+
+    # a HashMap in this process, for comparison
+    m = hash_map_oa.HashMap(11, fnv1a_hash)
+    start = time.perf_counter()
+    m.put_many(pairs)
+    put_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    m.get_many(keys)
+    get_seconds = time.perf_counter() - start
+    print(f"in process: put_many {len(pairs) / put_seconds:10,.0f} keys/s"
+          f"  get_many {len(keys) / get_seconds:10,.0f} keys/s")
+
+    for shards in (1, 2, 4):
+        with ShardedHashMap(shards, 'oa', 11, fnv1a_hash) as m:
+            start = time.perf_counter()
+            m.put_many(pairs)
+            put_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            values = m.get_many(keys)
+            get_seconds = time.perf_counter() - start
+
+            correct = all(values[i] == i for i in range(len(keys)))
+            print(f"{shards} shards:   put_many {len(pairs) / put_seconds:10,.0f} keys/s"
+                  f"  get_many {len(keys) / get_seconds:10,.0f} keys/s  {correct}")
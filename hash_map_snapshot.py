@@ -0,0 +1,130 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Binary snapshot files shared by both HashMaps (SC & OA).  A snapshot
+#              holds the bucket layout of a map, so it is loaded without rehashing
+
+import os
+import pickle
+import struct
+from itertools import islice
+
+# file header: magic, map kind, capacity, size, hash function name
+_MAGIC = b'HMAPSNP1'
+_HEADER = struct.Struct('<8s2sQQ64s')
+
+# records written per chunk
+CHUNK_SIZE = 65536
+
+
+def _function_name(function) -> bytes:
+    """Return the name of a hash function as stored in the header"""
+    return getattr(function, '__name__', '').encode('utf-8')[:64]
+
+
+def write_snapshot(path: str, kind: bytes, capacity: int, size: int, function,
+                   options: dict, records, chunk_size: int = CHUNK_SIZE) -> None:
+    """
+    Write a snapshot: the header, the pickled constructor options of the map, then
+    the records, pickled chunk_size at a time so only one chunk is held in memory.
+    A record is a (bucket index, hash, key, value) tuple; the map decides what
+    the records mean.  The file is written next to the path and renamed over it
+    when complete, so a failed dump never leaves a truncated snapshot behind.
+    """
+    temporary_path = path + '.tmp'
+    records = iter(records)
+
+    with open(temporary_path, 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, kind, capacity, size, _function_name(function)))
+        pickle.dump(options, file, pickle.HIGHEST_PROTOCOL)
+
+        while True:
+            chunk = list(islice(records, chunk_size))
+
+            if not chunk:
+                break
+
+            pickle.dump(chunk, file, pickle.HIGHEST_PROTOCOL)
+
+    os.replace(temporary_path, path)
+
+
+def read_snapshot(path: str, kind: bytes, function) -> tuple:
+    """
+    Open a snapshot written by write_snapshot() for a map of the given kind and hash
+    function and return (capacity, size, options, records), where records is a
+    generator that reads the records one chunk at a time and closes the file when
+    exhausted.  Snapshots contain pickles, so only load trusted files.
+    """
+    file = open(path, 'rb')
+
+    try:
+        header = file.read(_HEADER.size)
+
+        if len(header) != _HEADER.size or header[:8] != _MAGIC:
+            raise ValueError(f"not a hash map snapshot: {path}")
+
+        _, file_kind, capacity, size, name = _HEADER.unpack(header)
+
+        if file_kind != kind:
+            raise ValueError(f"snapshot of a {file_kind.decode()} map, not a {kind.decode()} map")
+
+        name = name.rstrip(b'\0')
+        if name != _function_name(function):
+            raise ValueError(f"snapshot was dumped with hash function {name.decode()}")
+
+        options = pickle.load(file)
+    except BaseException:
+        file.close()
+        raise
+
+    def records():
+        with file:
+            while True:
+                try:
+                    chunk = pickle.load(file)
+                except EOFError:
+                    break
+
+                yield from chunk
+
+    return capacity, size, options, records()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    import hash_map_oa
+    import hash_map_sc
+    from hash_functions import fnv1a_hash
+
+    path = os.path.join(tempfile.mkdtemp(), 'map.snapshot')
+
+    print("\nHashMap - dump and load against put")
+    print("-----------------------------------")
+    for map_class in (hash_map_sc.HashMap, hash_map_oa.HashMap):
+        m = map_class(11, fnv1a_hash)
+        for i in range(300000):
+            m.put('key' + str(i), i)
+        m.remove('key0')
+
+        start = time.perf_counter()
+        m.dump(path)
+        dump_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = map_class.load(path, fnv1a_hash)
+        load_seconds = time.perf_counter() - start
+
+        pairs = m.get_keys_and_values()
+        start = time.perf_counter()
+        rebuilt = map_class(11, fnv1a_hash)
+        for i in range(pairs.length()):
+            rebuilt.put(*pairs[i])
+        put_seconds = time.perf_counter() - start
+
+        print(f"{map_class.__module__}: {loaded.get_size()} {loaded.get_capacity() == m.get_capacity()}"
+              f" {loaded.get('key1')} {loaded.get('key0')}  dump {dump_seconds:.2f}s, load {load_seconds:.2f}s,"
+              f" put {put_seconds:.2f}s, {os.path.getsize(path) / 1e6:.1f} MB")
@@ -0,0 +1,89 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Counters recorded by both HashMaps (SC & OA) when they are created
+#              with stats=True.  A map without statistics only pays for checking
+#              that its counters are None.
+
+from time import perf_counter
+
+from a6_include import hash_keys
+
+# operations whose probes are counted
+OPERATIONS = ('put', 'get', 'contains_key', 'remove')
+
+
+class HashMapStats:
+    """
+    Probe counts per operation, hash function calls and resizes of a hash map.
+    A probe is a node of a chain compared with the key (SC) or a bucket inspected
+    by the probe sequence of the key (OA).
+    """
+
+    __slots__ = ('_counts', '_probes', '_max_probes', '_hash_calls', '_hash_seconds',
+                 '_resizes', '_resize_seconds', '_compactions')
+
+    def __init__(self) -> None:
+        """Initialize all the counters to zero"""
+        self._counts = dict.fromkeys(OPERATIONS, 0)
+        self._probes = dict.fromkeys(OPERATIONS, 0)
+        self._max_probes = dict.fromkeys(OPERATIONS, 0)
+        self._hash_calls = 0
+        self._hash_seconds = 0.0
+        self._resizes = 0
+        self._resize_seconds = 0.0
+        self._compactions = 0
+
+    def hash(self, function, key: str) -> int:
+        """Return the hash of a key, timing the hash function"""
+        start = perf_counter()
+        hash_value = function(key)
+        self._hash_seconds += perf_counter() - start
+        self._hash_calls += 1
+        return hash_value
+
+    def hash_many(self, function, keys: list) -> list:
+        """Return the hashes of a list of keys, timing the hash function"""
+        start = perf_counter()
+        hashes = hash_keys(function, keys)
+        self._hash_seconds += perf_counter() - start
+        self._hash_calls += len(keys)
+        return hashes
+
+    def record(self, operation: str, probes: int) -> None:
+        """Record the number of probes of one operation"""
+        self._counts[operation] += 1
+        self._probes[operation] += probes
+        if probes > self._max_probes[operation]:
+            self._max_probes[operation] = probes
+
+    def record_resize(self, seconds: float, compaction: bool = False) -> None:
+        """Record a resize, or a rebuild at the same capacity, and the time it took"""
+        self._resizes += 1
+        self._resize_seconds += seconds
+        if compaction:
+            self._compactions += 1
+
+    def record_migration(self, seconds: float) -> None:
+        """Record the time spent moving buckets for an incremental resize"""
+        self._resize_seconds += seconds
+
+    def snapshot(self) -> dict:
+        """Return a dictionary with a copy of the counters"""
+        operations = {}
+        for operation in OPERATIONS:
+            count = self._counts[operation]
+            operations[operation] = {
+                'count': count,
+                'probes': self._probes[operation],
+                'mean_probes': self._probes[operation] / count if count else 0.0,
+                'max_probes': self._max_probes[operation],
+            }
+
+        return {
+            'operations': operations,
+            'hash_calls': self._hash_calls,
+            'hash_seconds': self._hash_seconds,
+            'resizes': self._resizes,
+            'resize_seconds': self._resize_seconds,
+            'compactions': self._compactions,
+        }
@@ -0,0 +1,148 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Ordered buckets for the separate chaining HashMap (SC): a chain that
+#              grows too long is replaced by a bucket searched by binary search
+
+from bisect import bisect_left
+
+from a6_include import SLNode
+
+# a chain longer than this is treeified
+TREEIFY_THRESHOLD = 8
+
+# a treeified bucket shorter than this goes back to a linked list
+UNTREEIFY_THRESHOLD = 6
+
+
+class TreeBucket:
+    """
+    Bucket of the separate chaining HashMap that keeps its nodes in an array sorted
+    by (hash, key) and finds them by binary search, so a lookup costs O(log n)
+    comparisons however many keys of the bucket collide, even when their full hashes
+    are equal.  It replaces the linked list of a bucket whose chain grows longer
+    than TREEIFY_THRESHOLD and has the same methods, so the map uses both alike.
+    Keys with the same hash must be comparable with each other, as strings are.
+    """
+
+    __slots__ = ('_order', '_nodes')
+
+    def __init__(self, head: SLNode = None) -> None:
+        """
+        Initialize a bucket holding the nodes of the chain starting at the given node
+        """
+        nodes = []
+        while head:
+            nodes.append(head)
+            head = head.next
+
+        nodes.sort(key=lambda node: (node.hash, node.key))
+        self._nodes = nodes
+        self._order = [(node.hash, node.key) for node in nodes]
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'TREE [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """
+        Return an iterator over the nodes, in (hash, key) order.  It walks a copy of the
+        array, so nodes can be removed while iterating, as with a linked list, even if
+        the bucket is untreeified.
+        """
+        return iter(self._nodes[:])
+
+    def insert(self, key: str, value: object, hash: int) -> None:
+        """Insert a new node with the given key, value and hash of the key."""
+        self.insert_node(SLNode(key, value, None, hash))
+
+    def insert_node(self, node: SLNode) -> None:
+        """Insert an existing node, without allocating a new one."""
+        position = (node.hash, node.key)
+        index = bisect_left(self._order, position)
+        self._order.insert(index, position)
+        self._nodes.insert(index, node)
+        node.next = None
+
+    def detach(self) -> SLNode:
+        """
+        Remove all nodes from the bucket and return the first one, linked to the
+        others as in a linked list, or None if the bucket was empty.
+        """
+        head = None
+        for node in reversed(self._nodes):
+            node.next = head
+            head = node
+
+        self._nodes = []
+        self._order = []
+        return head
+
+    def _find(self, key: str, hash: int) -> int:
+        """Return the index of the node with matching key and hash, or -1."""
+        position = (hash, key)
+        index = bisect_left(self._order, position)
+
+        if index < len(self._order) and self._order[index] == position:
+            return index
+
+        return -1
+
+    def remove(self, key: str, hash: int) -> bool:
+        """
+        Remove the node with matching key.
+        Return True if removal was successful, False otherwise.
+        """
+        index = self._find(key, hash)
+
+        if index < 0:
+            return False
+
+        del self._order[index]
+        del self._nodes[index]
+        return True
+
+    def contains(self, key: str, hash: int) -> SLNode:
+        """Return node with matching key, or None if no match."""
+        index = self._find(key, hash)
+        return self._nodes[index] if index >= 0 else None
+
+    def length(self) -> int:
+        """Return the number of nodes of the bucket."""
+        return len(self._nodes)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import time
+    from itertools import permutations
+
+    import hash_map_sc
+    from a6_include import hash_function_1
+
+    print("\nTreeBucket - example 1")
+    print("----------------------")
+    bucket = TreeBucket()
+    for key in ('abc', 'bca', 'cab', 'z'):
+        bucket.insert(key, key.upper(), hash_function_1(key))
+    print(bucket, bucket.length())
+    print(bucket.contains('cab', hash_function_1('cab')), bucket.contains('acb', hash_function_1('acb')))
+    print(bucket.remove('bca', hash_function_1('bca')), bucket.remove('bca', hash_function_1('bca')), bucket)
+
+    print("\nTreeBucket - colliding keys with hash_function_1")
+    print("------------------------------------------------")
+    # every permutation of the same letters has the same hash_function_1 hash
+    keys = [''.join(letters) for letters in permutations('abcdefg')]
+
+    m = hash_map_sc.HashMap(len(keys), hash_function_1)
+    start = time.perf_counter()
+    for key in keys:
+        m.put(key, key)
+    put_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = sum(m.get(key) == key for key in keys)
+    get_seconds = time.perf_counter() - start
+
+    print(f"{len(keys)} keys, one bucket of {m.get_stats()['longest_chain']} nodes: "
+          f"put {put_seconds:.2f}s, get {get_seconds:.2f}s, found {found}")
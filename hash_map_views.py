@@ -0,0 +1,76 @@
+# Course: CS261 - Data Structures
+# Assignment: Assignment 6: HashMap (Portfolio Assignment)
+# Description: Views of the keys, values and key-value pairs of both HashMaps
+#              (SC & OA), read lazily from the buckets of the map through its
+#              _pairs() generator of (key, value) tuples
+
+
+class KeysView:
+    """
+    The keys of a HashMap.  Every loop over the view walks the buckets of the map
+    with its own iterator, so loops can be nested, and raises RuntimeError if the
+    map is resized while it runs.
+    """
+
+    __slots__ = ('_map',)
+
+    def __init__(self, map) -> None:
+        """Initialize a view of the given map"""
+        self._map = map
+
+    def __len__(self) -> int:
+        """Return the number of keys of the map"""
+        return self._map.get_size()
+
+    def __iter__(self):
+        """Return an iterator over the keys of the map"""
+        return (key for key, _ in self._map._pairs())
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if the key is in the map"""
+        return self._map.contains_key(key)
+
+
+class ValuesView:
+    """
+    The values of a HashMap, read as KeysView reads the keys.
+    """
+
+    __slots__ = ('_map',)
+
+    def __init__(self, map) -> None:
+        """Initialize a view of the given map"""
+        self._map = map
+
+    def __len__(self) -> int:
+        """Return the number of values of the map"""
+        return self._map.get_size()
+
+    def __iter__(self):
+        """Return an iterator over the values of the map"""
+        return (value for _, value in self._map._pairs())
+
+
+class ItemsView:
+    """
+    The (key, value) tuples of a HashMap, read as KeysView reads the keys.
+    """
+
+    __slots__ = ('_map',)
+
+    def __init__(self, map) -> None:
+        """Initialize a view of the given map"""
+        self._map = map
+
+    def __len__(self) -> int:
+        """Return the number of pairs of the map"""
+        return self._map.get_size()
+
+    def __iter__(self):
+        """Return an iterator over the (key, value) tuples of the map"""
+        return self._map._pairs()
+
+    def __contains__(self, item: tuple) -> bool:
+        """Return True if the key of the tuple is in the map with the value of the tuple"""
+        key, value = item
+        return self._map.contains_key(key) and self._map.get(key) == value